@@ -3,17 +3,114 @@
 import hashlib
 import json
 import logging
+import mmap
+import operator
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from src.models.backup_models import Backup, BackupMetadata, Archive, ArchiveEntry
-from src.models.filter_models import ProtonMailFilter
+from src.models.filter_models import FilterStatus, ProtonMailFilter
 from src.utils.config import SNAPSHOTS_DIR, TOOL_VERSION
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used as a fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Max threads used to read snapshot files concurrently in list_backups
+LIST_BACKUPS_WORKERS = 16
+
+# Snapshot directory names. The format is zero-padded and most-significant
+# first, so plain string order is chronological order: listing code sorts by
+# name and never parses a timestamp.
+SNAPSHOT_NAME_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+# How an unsynced manifest serializes synced_at (indented output, both backends)
+_UNSYNCED_MARKER = b'"synced_at": null'
+
+# File in the snapshots dir holding when a command last changed the live
+# account (toggles, deletes, uploads), as a UTC ISO timestamp
+REMOTE_WRITE_MARKER = ".last_remote_write"
+
+
+def _dumps(obj) -> bytes:
+    """Serialize obj to indented, key-sorted JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, indent=2, sort_keys=True, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _load_file(path: Path):
+    """Parse a JSON file.
+
+    With orjson the file is memory-mapped and parsed in place, skipping the
+    intermediate bytes copy of the whole file.
+    """
+    if orjson is None:
+        return json.loads(path.read_bytes())
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")  # mmap can't map empty files; raise the usual decode error
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _canonical(obj) -> bytes:
+    """Serialize obj to compact, key-sorted JSON bytes for hashing.
+
+    The backends agree on strings, bools, None and 64-bit integers, which
+    is all a filter's canonical dump holds, so checksums don't depend on
+    whether orjson is installed. They are not interchangeable in general:
+    some floats format differently (orjson writes 1e16 as 1e16, json as
+    1e+16) and orjson raises TypeError on integers wider than 64 bits.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def parse_snapshot_name(name: str) -> datetime:
+    """Parse a snapshot directory name (YYYY-MM-DD_HH-MM-SS) into a naive datetime.
+
+    Only needed when a real datetime is wanted; ordering snapshots never
+    requires it, since names sort chronologically as strings.
+    """
+    date_part, sep, time_part = name.partition("_")
+    if not sep:
+        raise ValueError(f"Not a snapshot name: {name!r}")
+    return datetime.fromisoformat(f"{date_part}T{time_part.replace('-', ':')}")
+
+
+def _compute_checksum(filter_dumps: List[dict], sieve_script: str, algorithm: str = "blake2b") -> str:
+    """Compute an '<algorithm>:<hexdigest>' checksum over filter dumps and sieve script."""
+    if algorithm == "sha256":
+        # Legacy format, kept so backups created before blake2b still verify
+        checksum_data = {
+            "filters": filter_dumps,
+            "sieve_script": sieve_script,
+        }
+        checksum_json = json.dumps(checksum_data, sort_keys=True, default=str)
+        return "sha256:" + hashlib.sha256(checksum_json.encode()).hexdigest()
+
+    payload = _canonical({
+        "filters": filter_dumps,
+        "sieve_script": sieve_script,
+    })
+    return "blake2b:" + hashlib.blake2b(payload, digest_size=32).hexdigest()
+
 
 class BackupManager:
     """Manages filter backups inside timestamped snapshot directories."""
@@ -28,7 +125,12 @@ class BackupManager:
         """Create a new backup inside a timestamped snapshot directory."""
         now = datetime.now()
 
-        enabled_count = sum(1 for f in filters if f.enabled)
+        # One pass collects the cached dumps (for checksum and file) and counts
+        filter_dumps = []
+        enabled_count = 0
+        for f in filters:
+            filter_dumps.append(f.canonical_dump)
+            enabled_count += f.enabled
         disabled_count = len(filters) - enabled_count
 
         metadata = BackupMetadata(
@@ -47,37 +149,44 @@ class BackupManager:
         )
 
         # Calculate checksum (includes sieve_script for integrity)
-        checksum_data = {
-            "filters": [f.model_dump() for f in filters],
-            "sieve_script": sieve_script,
-        }
-        checksum_json = json.dumps(checksum_data, sort_keys=True, default=str)
-        backup.checksum = "sha256:" + hashlib.sha256(checksum_json.encode()).hexdigest()
+        backup.checksum = _compute_checksum(filter_dumps, sieve_script)
 
         # Create snapshot subdirectory
-        dirname = now.strftime("%Y-%m-%d_%H-%M-%S")
+        dirname = now.strftime(SNAPSHOT_NAME_FORMAT)
         snapshot_dir = self.snapshots_dir / dirname
         snapshot_dir.mkdir(parents=True, exist_ok=True)
 
-        # Save backup.json inside the snapshot dir
+        # Save backup.json inside the snapshot dir, reusing the filter dumps
+        # instead of serializing every filter a second time
         filepath = snapshot_dir / "backup.json"
-        with open(filepath, "w") as f:
-            json.dump(backup.model_dump(), f, indent=2, default=str)
+        data = backup.model_dump(mode="json", exclude={"filters"})
+        data["filters"] = filter_dumps
+        filepath.write_bytes(_dumps(data))
+
+        # Small sidecar so list_backups doesn't have to parse every filter
+        (snapshot_dir / "metadata.json").write_bytes(_dumps(
+            backup.model_dump(mode="json", include={"timestamp", "metadata", "checksum"})
+        ))
 
         # Carry forward archive from previous snapshot before updating symlink
         self.carry_forward_archive(snapshot_dir)
 
-        # Update latest symlink at snapshots/latest -> dirname
-        latest_link = self.snapshots_dir / "latest"
-        if latest_link.exists() or latest_link.is_symlink():
-            latest_link.unlink()
-        latest_link.symlink_to(dirname)
+        # Update latest symlink at snapshots/latest -> dirname atomically:
+        # create it under a temp name, then rename over the old link
+        tmp_link = self.snapshots_dir / f".latest.tmp.{os.getpid()}"
+        tmp_link.unlink(missing_ok=True)
+        tmp_link.symlink_to(dirname)
+        os.replace(tmp_link, self.snapshots_dir / "latest")
 
         logger.info("Backup created: %s (%d filters)", snapshot_dir, len(filters))
         return backup
 
     def snapshot_dir_for(self, identifier: str = "latest") -> Path:
-        """Resolve a snapshot identifier to its directory path."""
+        """Resolve a snapshot identifier to its directory path.
+
+        Identifiers are 'latest' or a directory name in SNAPSHOT_NAME_FORMAT
+        (YYYY-MM-DD_HH-MM-SS), whose string order is chronological order.
+        """
         if identifier == "latest":
             latest_link = self.snapshots_dir / "latest"
             if not latest_link.exists():
@@ -89,6 +198,99 @@ class BackupManager:
             return candidate
         raise FileNotFoundError(f"Snapshot not found: {identifier}")
 
+    def unchanged_latest(self, filters: List[ProtonMailFilter], sieve_script: str = "") -> Optional[str]:
+        """Return the latest snapshot's name if it already holds exactly this content.
+
+        Compares the checksum create_backup would compute against the one in
+        the latest snapshot's metadata.json (in that snapshot's algorithm), so
+        backup.json itself is never read. Returns None when there is no latest
+        snapshot, it predates the sidecar, the sidecar is unreadable, or the
+        content differs.
+        """
+        try:
+            snapshot_dir = self.snapshot_dir_for("latest")
+            metadata = _loads((snapshot_dir / "metadata.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+        checksum = metadata.get("checksum") if isinstance(metadata, dict) else None
+        if not isinstance(checksum, str):
+            return None
+        algorithm = checksum.partition(":")[0]
+        if algorithm not in ("blake2b", "sha256"):
+            return None
+        if _compute_checksum([f.canonical_dump for f in filters], sieve_script, algorithm) != checksum:
+            return None
+        return snapshot_dir.name
+
+    def latest_snapshot_age(self) -> Optional[float]:
+        """Seconds since the latest snapshot was taken, or None if there is none.
+
+        The age comes from the snapshot's directory name rather than its
+        mtime, which later archive writes would bump.
+        """
+        try:
+            snapshot_dir = self.snapshot_dir_for("latest")
+            taken_at = parse_snapshot_name(snapshot_dir.name)
+        except (FileNotFoundError, ValueError):
+            return None
+        return (datetime.now() - taken_at).total_seconds()
+
+    def record_remote_write(self):
+        """Note that the live account is about to be changed.
+
+        Called before toggling, deleting or uploading, so even a write that
+        fails halfway marks earlier snapshots as out of date.
+        """
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        (self.snapshots_dir / REMOTE_WRITE_MARKER).write_text(datetime.now(timezone.utc).isoformat())
+
+    def written_since_latest(self) -> bool:
+        """Whether the live account may have changed after the latest snapshot.
+
+        Checks the record_remote_write() marker and every manifest's
+        synced_at (which also covers syncs from before the marker existed)
+        against the snapshot's timestamp. Names have one-second resolution,
+        so a write in the same second counts as newer, as does any stamp
+        that can't be read.
+        """
+        try:
+            taken_at = parse_snapshot_name(self.snapshot_dir_for("latest").name).astimezone()
+        except (FileNotFoundError, ValueError):
+            return True
+
+        stamps = []
+        try:
+            stamps.append((self.snapshots_dir / REMOTE_WRITE_MARKER).read_text())
+        except FileNotFoundError:
+            pass
+        with os.scandir(self.snapshots_dir) as it:
+            names = [
+                entry.name for entry in it
+                if entry.name != "latest" and not entry.name.startswith(".") and entry.is_dir()
+            ]
+        for name in names:
+            try:
+                raw = (self.snapshots_dir / name / "manifest.json").read_bytes()
+            except FileNotFoundError:
+                continue
+            if _UNSYNCED_MARKER in raw:
+                continue
+            try:
+                manifest = _loads(raw)
+            except ValueError:
+                return True
+            if isinstance(manifest, dict) and manifest.get("synced_at"):
+                stamps.append(manifest["synced_at"])
+
+        for stamp in stamps:
+            try:
+                written_at = datetime.fromisoformat(stamp.strip())
+            except (AttributeError, ValueError):
+                return True
+            if written_at.tzinfo is None or written_at >= taken_at:
+                return True
+        return False
+
     def load_backup(self, identifier: str = "latest") -> Backup:
         """Load a backup by timestamp or 'latest'."""
         snapshot_dir = self.snapshot_dir_for(identifier)
@@ -96,8 +298,7 @@ class BackupManager:
         if not filepath.exists():
             raise FileNotFoundError(f"No backup.json in snapshot: {snapshot_dir}")
 
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        data = _load_file(filepath)
 
         backup = Backup.model_validate(data)
         logger.info("Loaded backup: %s (%d filters)", filepath, len(backup.filters))
@@ -105,30 +306,50 @@ class BackupManager:
 
     def list_backups(self) -> List[dict]:
         """List all available snapshots with metadata."""
-        backups = []
+        # One directory scan; DirEntry caches the file type, so no per-entry stat
+        with os.scandir(self.snapshots_dir) as it:
+            entries = [
+                entry for entry in it
+                if entry.name != "latest" and not entry.name.startswith(".") and entry.is_dir()
+            ]
+        if not entries:
+            return []
+        # Names sort chronologically as strings (see SNAPSHOT_NAME_FORMAT)
+        entries.sort(key=operator.attrgetter("name"))
 
-        for entry in sorted(self.snapshots_dir.iterdir()):
-            if entry.name == "latest" or not entry.is_dir():
-                continue
-            backup_file = entry / "backup.json"
-            if not backup_file.exists():
-                continue
+        # Snapshot reads are independent and latency-bound; overlap them
+        with ThreadPoolExecutor(max_workers=min(LIST_BACKUPS_WORKERS, len(entries))) as pool:
+            summaries = pool.map(self._read_snapshot_summary, entries)
+        return [s for s in summaries if s is not None]
+
+    def _read_snapshot_summary(self, entry: os.DirEntry) -> Optional[dict]:
+        """Summarize one snapshot for list_backups (None if it has no backup.json).
+
+        Reads the metadata.json sidecar, falling back to the full backup.json
+        for snapshots created before the sidecar existed.
+        """
+        backup_file = os.path.join(entry.path, "backup.json")
+        try:
+            size_bytes = os.stat(backup_file).st_size
+        except FileNotFoundError:
+            return None
+        try:
             try:
-                with open(backup_file, "r") as f:
-                    data = json.load(f)
-                backups.append({
-                    "snapshot": entry.name,
-                    "path": str(entry),
-                    "timestamp": data.get("timestamp", ""),
-                    "filter_count": data.get("metadata", {}).get("filter_count", 0),
-                    "enabled_count": data.get("metadata", {}).get("enabled_count", 0),
-                    "disabled_count": data.get("metadata", {}).get("disabled_count", 0),
-                    "size_bytes": backup_file.stat().st_size,
-                })
-            except Exception as e:
-                logger.warning("Failed to read snapshot %s: %s", entry, e)
-
-        return backups
+                data = _loads(Path(entry.path, "metadata.json").read_bytes())
+            except FileNotFoundError:
+                data = _loads(Path(backup_file).read_bytes())
+            return {
+                "snapshot": entry.name,
+                "path": entry.path,
+                "timestamp": data.get("timestamp", ""),
+                "filter_count": data.get("metadata", {}).get("filter_count", 0),
+                "enabled_count": data.get("metadata", {}).get("enabled_count", 0),
+                "disabled_count": data.get("metadata", {}).get("disabled_count", 0),
+                "size_bytes": size_bytes,
+            }
+        except Exception as e:
+            logger.warning("Failed to read snapshot %s: %s", entry.path, e)
+            return None
 
     def verify_backup(self, backup: Backup) -> bool:
         """Verify backup integrity using checksum."""
@@ -136,21 +357,49 @@ class BackupManager:
             logger.warning("Backup has no checksum")
             return False
 
-        checksum_data = {
-            "filters": [f.model_dump() for f in backup.filters],
-            "sieve_script": backup.sieve_script,
-        }
-        checksum_json = json.dumps(checksum_data, sort_keys=True, default=str)
-        computed = "sha256:" + hashlib.sha256(checksum_json.encode()).hexdigest()
+        algorithm = backup.checksum.partition(":")[0]
+        if algorithm not in ("blake2b", "sha256"):
+            logger.error("Unknown checksum algorithm: %s", algorithm)
+            return False
+        computed = _compute_checksum(
+            [f.canonical_dump for f in backup.filters], backup.sieve_script, algorithm,
+        )
 
         is_valid = computed == backup.checksum
         if not is_valid:
             logger.error("Checksum mismatch! Expected %s, got %s", backup.checksum, computed)
         return is_valid
 
+    def verify_snapshot(self, identifier: str = "latest") -> bool:
+        """Verify a snapshot's backup.json on disk against its stored checksum.
+
+        The filters in backup.json are already stored in canonical dump form,
+        so they are hashed straight from the parsed JSON without validating
+        them into models and dumping them back.
+        """
+        filepath = self.snapshot_dir_for(identifier) / "backup.json"
+        if not filepath.exists():
+            raise FileNotFoundError(f"No backup.json in snapshot: {filepath.parent}")
+
+        data = _loads(filepath.read_bytes())
+        checksum = data.get("checksum", "")
+        if not checksum:
+            logger.warning("Backup has no checksum: %s", filepath)
+            return False
+
+        algorithm = checksum.partition(":")[0]
+        if algorithm not in ("blake2b", "sha256"):
+            logger.error("Unknown checksum algorithm: %s", algorithm)
+            return False
+        computed = _compute_checksum(data.get("filters", []), data.get("sieve_script", ""), algorithm)
+
+        is_valid = computed == checksum
+        if not is_valid:
+            logger.error("Checksum mismatch in %s! Expected %s, got %s", filepath, checksum, computed)
+        return is_valid
+
     def delete_backup(self, identifier: str) -> bool:
         """Delete a snapshot directory."""
-        import shutil
         candidate = self.snapshots_dir / identifier
         if candidate.is_dir():
             shutil.rmtree(candidate)
@@ -165,7 +414,7 @@ class BackupManager:
         """Serialize archive entries to archive.json in the snapshot directory."""
         archive = Archive(entries=entries)
         archive_path = snapshot_dir / "archive.json"
-        archive_path.write_text(json.dumps(archive.model_dump(), indent=2, default=str))
+        archive_path.write_bytes(_dumps(archive.model_dump(mode="json")))
         logger.info("Archive written: %s (%d entries)", archive_path, len(entries))
 
     def load_archive(self, snapshot_dir: Path) -> List[ArchiveEntry]:
@@ -173,30 +422,86 @@ class BackupManager:
         archive_path = snapshot_dir / "archive.json"
         if not archive_path.exists():
             return []
-        data = json.loads(archive_path.read_text())
+        data = _load_file(archive_path)
         archive = Archive.model_validate(data)
         return archive.entries
 
-    def carry_forward_archive(self, target_dir: Path) -> List[ArchiveEntry]:
+    def set_filter_statuses(self, identifier: str, updates: Dict[str, FilterStatus]) -> Dict[str, str]:
+        """Set the status of filters by name in a snapshot's archive.
+
+        Names already in archive.json are updated in place; names found only
+        in backup.json get a new archive entry (the backup stays immutable).
+        backup.json is only read when some name misses the archive, and
+        archive.json is written once for the whole batch, or not at all if
+        nothing changed.
+
+        Returns a mapping of name -> "updated", "unchanged", "created" or
+        "not_found".
+        """
+        snapshot_dir = self.snapshot_dir_for(identifier)
+        entries = self.load_archive(snapshot_dir)
+        archive_idx: Dict[str, int] = {}
+        for i, entry in enumerate(entries):
+            archive_idx.setdefault(entry.filter.name, i)
+
+        backup_by_name: Dict[str, ProtonMailFilter] = {}
+        if any(name not in archive_idx for name in updates):
+            for f in self.load_backup(identifier).filters:
+                backup_by_name.setdefault(f.name, f)
+
+        results: Dict[str, str] = {}
+        now_ts = datetime.now(timezone.utc).isoformat()
+        for name, status in updates.items():
+            enabled = status == FilterStatus.ENABLED
+            idx = archive_idx.get(name)
+            if idx is not None:
+                current = entries[idx].filter
+                if current.status == status and current.enabled == enabled:
+                    results[name] = "unchanged"
+                    continue
+                entries[idx].filter.status = status
+                entries[idx].filter.enabled = enabled
+                results[name] = "updated"
+            elif name in backup_by_name:
+                entries.append(ArchiveEntry(
+                    filter=backup_by_name[name].model_copy(update={"status": status, "enabled": enabled}),
+                    archived_at=now_ts,
+                    source_snapshot=snapshot_dir.name,
+                ))
+                archive_idx[name] = len(entries) - 1
+                results[name] = "created"
+            else:
+                results[name] = "not_found"
+
+        if any(result in ("updated", "created") for result in results.values()):
+            self.write_archive(snapshot_dir, entries)
+        return results
+
+    def carry_forward_archive(self, target_dir: Path) -> bool:
         """Copy archive.json from the latest symlink to target_dir.
 
-        Returns the carried-forward entries (empty list if no previous archive).
+        The file is copied as-is and never parsed, so the cost doesn't grow
+        with the number of entries; use load_archive(target_dir) for them.
+        Returns whether an archive was copied.
         """
         latest_link = self.snapshots_dir / "latest"
         if not latest_link.exists() and not latest_link.is_symlink():
-            return []
+            return False
         try:
             prev_dir = latest_link.resolve()
         except OSError:
-            return []
+            return False
         if prev_dir == target_dir:
             # Don't carry forward from ourselves
-            return []
-        entries = self.load_archive(prev_dir)
-        if entries:
-            self.write_archive(target_dir, entries)
-            logger.info("Archive carried forward: %d entries from %s", len(entries), prev_dir.name)
-        return entries
+            return False
+        prev_archive = prev_dir / "archive.json"
+        if not prev_archive.exists():
+            return False
+        # copyfile lets the kernel do the copy (or a CoW clone, where the
+        # filesystem supports it) without a round trip through Python
+        shutil.copyfile(prev_archive, target_dir / "archive.json")
+        logger.info("Archive carried forward from %s", prev_dir.name)
+        return True
 
     # --- Manifest methods ---
 
@@ -211,7 +516,7 @@ class BackupManager:
             "synced_at": None,
         }
         manifest_path = snapshot_dir / "manifest.json"
-        manifest_path.write_text(json.dumps(manifest, indent=2))
+        manifest_path.write_bytes(_dumps(manifest))
         logger.info("Manifest written: %s (%d filters)", manifest_path, len(filters))
 
     def load_manifest(self, snapshot_dir: Path) -> Optional[dict]:
@@ -219,7 +524,7 @@ class BackupManager:
         manifest_path = snapshot_dir / "manifest.json"
         if not manifest_path.exists():
             return None
-        return json.loads(manifest_path.read_text())
+        return _loads(manifest_path.read_bytes())
 
     def promote_manifest(self, snapshot_dir: Path) -> bool:
         """Mark a manifest as synced by setting synced_at."""
@@ -228,17 +533,42 @@ class BackupManager:
             return False
         manifest["synced_at"] = datetime.now(timezone.utc).isoformat()
         manifest_path = snapshot_dir / "manifest.json"
-        manifest_path.write_text(json.dumps(manifest, indent=2))
+        manifest_path.write_bytes(_dumps(manifest))
         logger.info("Manifest promoted (synced): %s", manifest_path)
         return True
 
+    def write_consolidation_args(self, snapshot_dir: Path, args: dict):
+        """Write consolidation_args.json into a snapshot directory."""
+        args_path = snapshot_dir / "consolidation_args.json"
+        args_path.write_bytes(_dumps(args))
+        logger.info("Consolidation args written: %s", args_path)
+
+    def load_consolidation_args(self, snapshot_dir: Path) -> Optional[dict]:
+        """Load consolidation_args.json from a snapshot directory."""
+        args_path = snapshot_dir / "consolidation_args.json"
+        if not args_path.exists():
+            return None
+        return _loads(args_path.read_bytes())
+
     def load_synced_hashes(self) -> Optional[set]:
         """Load filter content hashes from the latest synced manifest."""
-        # Walk snapshots in reverse chronological order, find latest synced one
-        for entry in sorted(self.snapshots_dir.iterdir(), reverse=True):
-            if entry.name == "latest" or not entry.is_dir():
+        # Walk snapshots in reverse chronological order, find latest synced one;
+        # name order is chronological (see SNAPSHOT_NAME_FORMAT)
+        with os.scandir(self.snapshots_dir) as it:
+            names = sorted(
+                (entry.name for entry in it
+                 if entry.name != "latest" and not entry.name.startswith(".") and entry.is_dir()),
+                reverse=True,
+            )
+        for name in names:
+            try:
+                raw = (self.snapshots_dir / name / "manifest.json").read_bytes()
+            except FileNotFoundError:
+                continue
+            # Cheap reject of unsynced manifests before paying for a full parse
+            if _UNSYNCED_MARKER in raw:
                 continue
-            manifest = self.load_manifest(entry)
-            if manifest and manifest.get("synced_at"):
+            manifest = _loads(raw)
+            if manifest.get("synced_at"):
                 return set(manifest.get("filter_hashes", []))
         return None
@@ -10,7 +10,7 @@ from src.models.backup_models import Backup
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class FilterDiff:
     """Represents differences between two filter states."""
     added: List[ProtonMailFilter] = field(default_factory=list)
@@ -35,27 +35,22 @@ class DiffEngine:
         """Core comparison logic."""
         diff = FilterDiff()
 
-        old_by_name = {f.name: f for f in old_filters}
-        new_by_name = {f.name: f for f in new_filters}
-
-        old_names = set(old_by_name.keys())
-        new_names = set(new_by_name.keys())
-
-        # Added filters (in new but not in old)
-        for name in new_names - old_names:
-            diff.added.append(new_by_name[name])
-
-        # Removed filters (in old but not in new)
-        for name in old_names - new_names:
-            diff.removed.append(old_by_name[name])
-
-        # Compare common filters
-        for name in old_names & new_names:
-            old_f = old_by_name[name]
-            new_f = new_by_name[name]
-
+        # One joint index by name: [old, new], either side may be missing
+        joint: Dict[str, List[Optional[ProtonMailFilter]]] = {}
+        for f in old_filters:
+            joint.setdefault(f.name, [None, None])[0] = f
+        for f in new_filters:
+            joint.setdefault(f.name, [None, None])[1] = f
+
+        for old_f, new_f in joint.values():
+            if old_f is None:
+                # Added filters (in new but not in old)
+                diff.added.append(new_f)
+            elif new_f is None:
+                # Removed filters (in old but not in new)
+                diff.removed.append(old_f)
             # Check if only enabled/status state changed
-            if old_f.enabled != new_f.enabled or old_f.status != new_f.status:
+            elif old_f.enabled != new_f.enabled or old_f.status != new_f.status:
                 if self._filters_equal_except_enabled(old_f, new_f):
                     diff.state_changed.append((old_f, new_f))
                 else:
@@ -69,20 +64,11 @@ class DiffEngine:
 
     def _filters_equal(self, f1: ProtonMailFilter, f2: ProtonMailFilter) -> bool:
         """Check if two filters are identical (status excluded, like enabled)."""
-        d1 = f1.model_dump()
-        d2 = f2.model_dump()
-        d1.pop("status", None)
-        d2.pop("status", None)
-        return d1 == d2
+        return f1.fingerprint == f2.fingerprint
 
     def _filters_equal_except_enabled(self, f1: ProtonMailFilter, f2: ProtonMailFilter) -> bool:
         """Check if filters are identical except for enabled/status state."""
-        d1 = f1.model_dump()
-        d2 = f2.model_dump()
-        for key in ("enabled", "status"):
-            d1.pop(key, None)
-            d2.pop(key, None)
-        return d1 == d2
+        return f1.fingerprint_ignoring_enabled == f2.fingerprint_ignoring_enabled
 
     def generate_summary(self, diff: FilterDiff) -> dict:
         """Generate a summary of the diff."""
@@ -2,7 +2,7 @@
 
 import asyncio
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from src.models.backup_models import Backup
 from src.models.filter_models import ProtonMailFilter, FilterStatus
@@ -15,8 +15,17 @@ logger = logging.getLogger(__name__)
 class RestoreEngine:
     """Restore filter state from a backup."""
 
-    def __init__(self, sync: ProtonMailSync):
+    def __init__(self, sync: ProtonMailSync, concurrency: int = 1):
+        """Create a restore engine.
+
+        Args:
+            sync: Logged-in sync client used to toggle filters.
+            concurrency: Max toggles in flight at once. Defaults to 1 because
+                all toggles drive the same ProtonMail page; raise it only for
+                sync clients that can handle independent concurrent requests.
+        """
         self.sync = sync
+        self.concurrency = max(1, concurrency)
 
     async def restore_from_backup(self, backup: Backup, current_filters: List[ProtonMailFilter]) -> dict:
         """Restore filters to match backup state.
@@ -40,6 +49,7 @@ class RestoreEngine:
         backup_by_name = {f.name: f for f in backup.filters}
         current_by_name = {f.name: f for f in current_filters}
 
+        to_apply = []
         for name, backup_filter in backup_by_name.items():
             # Skip archived/deprecated — they're not on ProtonMail
             if backup_filter.status in (FilterStatus.ARCHIVED, FilterStatus.DEPRECATED):
@@ -57,22 +67,13 @@ class RestoreEngine:
                 report["already_correct"].append(name)
                 continue
 
-            try:
-                if backup_filter.enabled:
-                    success = await self.sync.enable_filter(name)
-                    if success:
-                        report["enabled"].append(name)
-                    else:
-                        report["errors"].append(f"Failed to enable: {name}")
-                else:
-                    success = await self.sync.disable_filter(name)
-                    if success:
-                        report["disabled"].append(name)
-                    else:
-                        report["errors"].append(f"Failed to disable: {name}")
-            except Exception as e:
-                report["errors"].append(f"{name}: {e}")
-                logger.error("Error restoring filter '%s': %s", name, e)
+            to_apply.append((name, backup_filter.enabled))
+
+        # Toggle with bounded concurrency; gather keeps results in backup order
+        sem = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._apply(sem, name, enabled) for name, enabled in to_apply))
+        for key, entry in results:
+            report[key].append(entry)
 
         logger.info(
             "Restore complete: %d enabled, %d disabled, %d not found, %d already correct, %d errors",
@@ -81,3 +82,18 @@ class RestoreEngine:
             len(report["errors"]),
         )
         return report
+
+    async def _apply(self, sem: asyncio.Semaphore, name: str, enabled: bool) -> Tuple[str, str]:
+        """Enable or disable one filter. Returns (report key, report entry)."""
+        async with sem:
+            try:
+                if enabled:
+                    if await self.sync.enable_filter(name):
+                        return "enabled", name
+                    return "errors", f"Failed to enable: {name}"
+                if await self.sync.disable_filter(name):
+                    return "disabled", name
+                return "errors", f"Failed to disable: {name}"
+            except Exception as e:
+                logger.error("Error restoring filter '%s': %s", name, e)
+                return "errors", f"{name}: {e}"
@@ -1,18 +1,19 @@
 """Main consolidation engine that applies strategies to optimize filters."""
 
 import logging
-from typing import List, Dict, Optional, Set
+from collections import Counter
+from typing import AbstractSet, List, Optional, Set
 from dataclasses import dataclass, field
 
 from src.models.filter_models import ProtonMailFilter, ConsolidatedFilter, FilterStatus
-from src.consolidator.strategies.group_by_action import group_by_action
-from src.consolidator.strategies.merge_conditions import merge_conditions
+from src.consolidator.strategies.group_by_action import build_consolidated, group_filters
+from src.consolidator.strategies.merge_conditions import merge_condition_groups
 from src.consolidator.strategies.optimize_ordering import optimize_ordering
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsolidationReport:
     """Report showing consolidation results."""
     original_count: int = 0
@@ -22,7 +23,7 @@ class ConsolidationReport:
     disabled_included: int = 0
     archived_count: int = 0
     excluded_count: int = 0
-    groups: Dict[str, int] = field(default_factory=dict)  # action -> count of merged filters
+    groups: Counter[str] = field(default_factory=Counter)  # action -> count of merged filters
     reduction_percent: float = 0.0
 
 
@@ -31,49 +32,66 @@ def _select_filters(
     include_disabled: bool = False,
     synced_filter_hashes: Optional[Set[str]] = None,
     archived_filters: Optional[List[ProtonMailFilter]] = None,
-    exclude_names: Optional[Set[str]] = None,
+    exclude_names: Optional[AbstractSet[str]] = None,
 ) -> tuple[List[ProtonMailFilter], int, int, int, int]:
     """Select which filters to process based on status and sync manifest.
 
     Returns (selected_filters, disabled_skipped, disabled_included, archived_count, excluded_count).
     """
-    _exclude_names = exclude_names or set()
+    _exclude_names = exclude_names or frozenset()
     selected = []
     disabled_skipped = 0
     disabled_included = 0
     excluded_count = 0
 
-    # Always include archived filters from archive param
+    # Always include archived filters from archive param. Most runs have no
+    # archive, so skip the loop outright; note an excluded name is counted
+    # here even if deprecated, unlike in the main loop below.
     _archived = archived_filters or []
-    for f in _archived:
-        if f.name in _exclude_names:
-            excluded_count += 1
-            continue
-        if f.status == FilterStatus.DEPRECATED:
-            continue
-        selected.append(f)
-
-    for f in filters:
-        # DEPRECATED → always skip
-        if f.status == FilterStatus.DEPRECATED:
-            continue
-
-        # Skip if excluded by name
-        if f.name in _exclude_names:
-            excluded_count += 1
-            continue
-
-        if include_disabled:
+    if _archived and not _exclude_names:
+        selected = [f for f in _archived if f.status != FilterStatus.DEPRECATED]
+    elif _archived:
+        for f in _archived:
+            if f.name in _exclude_names:
+                excluded_count += 1
+                continue
+            if f.status == FilterStatus.DEPRECATED:
+                continue
+            selected.append(f)
+
+    # Drop excluded names up front, so the main loop carries no name check.
+    # Exclusions often name filters that no longer exist (carried over from
+    # an earlier run); the disjointness probe skips the rebuild for those.
+    if _exclude_names and not _exclude_names.isdisjoint(f.name for f in filters):
+        kept = []
+        for f in filters:
+            if f.status != FilterStatus.DEPRECATED and f.name in _exclude_names:
+                excluded_count += 1
+            else:
+                kept.append(f)
+        filters = kept
+
+    # Specialize the main loop on include_disabled rather than re-testing it per filter
+    if include_disabled:
+        for f in filters:
+            # DEPRECATED → always skip
+            if f.status == FilterStatus.DEPRECATED:
+                continue
             selected.append(f)
             if not f.enabled:
                 disabled_included += 1
-        elif f.enabled:
-            selected.append(f)
-        elif synced_filter_hashes and f.content_hash in synced_filter_hashes:
-            selected.append(f)
-            disabled_included += 1
-        else:
-            disabled_skipped += 1
+    else:
+        for f in filters:
+            # DEPRECATED → always skip
+            if f.status == FilterStatus.DEPRECATED:
+                continue
+            if f.enabled:
+                selected.append(f)
+            elif synced_filter_hashes and f.content_hash in synced_filter_hashes:
+                selected.append(f)
+                disabled_included += 1
+            else:
+                disabled_skipped += 1
 
     return selected, disabled_skipped, disabled_included, len(_archived), excluded_count
 
@@ -87,7 +105,7 @@ class ConsolidationEngine:
         include_disabled: bool = False,
         synced_filter_hashes: Optional[Set[str]] = None,
         archived_filters: Optional[List[ProtonMailFilter]] = None,
-        exclude_names: Optional[Set[str]] = None,
+        exclude_names: Optional[AbstractSet[str]] = None,
     ) -> tuple[List[ConsolidatedFilter], ConsolidationReport]:
         """Apply all consolidation strategies and return optimized filters + report."""
         report = ConsolidationReport()
@@ -105,39 +123,52 @@ class ConsolidationEngine:
         logger.info("Starting consolidation: %d total, %d selected, %d disabled-skipped, %d disabled-included, %d archived, %d excluded",
                      len(filters), len(selected), disabled_skipped, disabled_included, archived_count, excluded_count)
 
-        # Strategy 1: Group by action
-        consolidated = group_by_action(selected)
-
-        # Strategy 2: Merge similar conditions
-        consolidated = merge_conditions(consolidated)
-
-        # Strategy 3: Optimize ordering
-        consolidated = optimize_ordering(consolidated)
+        consolidated = self._fused_consolidate(selected)
 
         # Build report
         report.consolidated_count = len(consolidated)
         if report.original_count > 0:
             report.reduction_percent = (1 - report.consolidated_count / report.enabled_count) * 100 if report.enabled_count > 0 else 0
 
+        # Accumulate straight into the report's Counter. Weighted counts rule out
+        # a mapping update per filter: it would merge two actions sharing a
+        # label (e.g. two label actions) into one increment.
+        groups = report.groups
         for cf in consolidated:
+            filter_count = cf.filter_count
             for action in cf.actions:
-                action_desc = action.type.value
-                if action.parameters.get("folder"):
-                    action_desc += f" ({action.parameters['folder']})"
-                report.groups[action_desc] = report.groups.get(action_desc, 0) + cf.filter_count
+                groups[action.group_label] += filter_count
 
         logger.info("Consolidation complete: %d -> %d filters (%.1f%% reduction)",
                      report.enabled_count, report.consolidated_count, report.reduction_percent)
 
         return consolidated, report
 
+    @staticmethod
+    def _fused_consolidate(selected: List[ProtonMailFilter]) -> List[ConsolidatedFilter]:
+        """Run the three strategies in one traversal.
+
+        Equivalent to optimize_ordering(merge_conditions(group_by_action(selected))),
+        but conditions are merged while each group is built, so no intermediate
+        list of consolidated filters is materialized and rebuilt.
+        """
+        # Strategies 1 + 2: group by action, merging similar conditions per group
+        consolidated = [
+            build_consolidated(group, merge_condition_groups)
+            for group in group_filters(selected).values()
+        ]
+        logger.info("Grouped %d filters into %d consolidated filters", len(selected), len(consolidated))
+
+        # Strategy 3: Optimize ordering
+        return optimize_ordering(consolidated)
+
     def analyze(
         self,
         filters: List[ProtonMailFilter],
         include_disabled: bool = False,
         synced_filter_hashes: Optional[Set[str]] = None,
         archived_filters: Optional[List[ProtonMailFilter]] = None,
-        exclude_names: Optional[Set[str]] = None,
+        exclude_names: Optional[AbstractSet[str]] = None,
     ) -> dict:
         """Analyze filters without consolidating. Returns statistics."""
         selected, disabled_skipped, disabled_included, archived_count, excluded_count = _select_filters(
@@ -145,31 +176,26 @@ class ConsolidationEngine:
         )
         disabled = len(filters) - len(selected)
 
-        # Count by action type
-        action_counts = {}
-        for f in selected:
-            for action in f.actions:
-                key = action.type.value
-                if action.parameters.get("folder"):
-                    key += f" -> {action.parameters['folder']}"
-                action_counts[key] = action_counts.get(key, 0) + 1
-
-        # Count by condition type
-        condition_counts = {}
-        for f in selected:
-            for cond in f.conditions:
-                condition_counts[cond.type.value] = condition_counts.get(cond.type.value, 0) + 1
+        # Count by action type and by condition type; Counter.update does the
+        # increments in C
+        action_counts = Counter()
+        condition_counts = Counter()
+        action_counts.update(a.analysis_label for f in selected for a in f.actions)
+        condition_counts.update(c.type.value for f in selected for c in f.conditions)
+
+        # most_common() is stable, so ties keep first-seen order
+        action_distribution = dict(action_counts.most_common())
 
         # Identify consolidation opportunities
-        opportunities = {k: v for k, v in action_counts.items() if v > 1}
+        opportunities = {k: v for k, v in action_distribution.items() if v > 1}
 
         return {
             "total_filters": len(filters),
             "enabled": len(selected),
             "disabled": disabled,
             "disabled_included": disabled_included,
-            "action_distribution": dict(sorted(action_counts.items(), key=lambda x: -x[1])),
-            "condition_distribution": dict(sorted(condition_counts.items(), key=lambda x: -x[1])),
-            "consolidation_opportunities": dict(sorted(opportunities.items(), key=lambda x: -x[1])),
+            "action_distribution": action_distribution,
+            "condition_distribution": dict(condition_counts.most_common()),
+            "consolidation_opportunities": opportunities,
             "potential_reduction": len(selected) - len(opportunities) if opportunities else 0,
         }
@@ -1,7 +1,9 @@
 """Strategy: Group filters by their action and merge into condition groups."""
 
 import logging
-from typing import List, Dict
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
 
 from src.models.filter_models import (
     ProtonMailFilter, ConsolidatedFilter, ConditionGroup,
@@ -11,15 +13,46 @@ from src.models.filter_models import (
 logger = logging.getLogger(__name__)
 
 
-def _action_key(action: FilterAction) -> str:
-    """Create a hashable key for an action."""
-    params_key = ":".join(f"{k}={v}" for k, v in sorted(action.parameters.items()))
-    return f"{action.type.value}|{params_key}"
+def group_filters(filters: List[ProtonMailFilter]) -> Dict[frozenset, List[ProtonMailFilter]]:
+    """Bucket filters by their action key, preserving first-seen order."""
+    groups: Dict[frozenset, List[ProtonMailFilter]] = defaultdict(list)
 
+    for f in filters:
+        groups[f.actions_key].append(f)
+
+    return groups
 
-def _actions_key(actions: List[FilterAction]) -> str:
-    """Create a hashable key for a list of actions."""
-    return "||".join(sorted(_action_key(a) for a in actions))
+
+def build_consolidated(
+    group: List[ProtonMailFilter],
+    merge_groups: Optional[Callable[[List[ConditionGroup]], List[ConditionGroup]]] = None,
+) -> ConsolidatedFilter:
+    """Build one consolidated filter from a bucket of filters sharing actions.
+
+    Each filter's conditions become a ConditionGroup. If merge_groups is
+    given, it is applied to those groups before the filter is built, so
+    callers can fold in condition merging without a second pass.
+    """
+    if len(group) == 1:
+        f = group[0]
+        condition_groups = [ConditionGroup(logic=f.logic, conditions=f.conditions)]
+        name = f.name
+    else:
+        # Each filter becomes its own condition group, preserving its logic
+        condition_groups = [ConditionGroup(logic=f.logic, conditions=f.conditions) for f in group]
+        action_desc = _describe_actions(group[0].actions)
+        name = f"{action_desc} (consolidated from {len(group)} filters)"
+
+    if merge_groups is not None:
+        condition_groups = merge_groups(condition_groups)
+
+    return ConsolidatedFilter(
+        name=name,
+        condition_groups=condition_groups,
+        actions=group[0].actions,
+        source_filters=[f.name for f in group],
+        filter_count=len(group),
+    )
 
 
 def group_by_action(filters: List[ProtonMailFilter]) -> List[ConsolidatedFilter]:
@@ -32,49 +65,7 @@ def group_by_action(filters: List[ProtonMailFilter]) -> List[ConsolidatedFilter]
     This preserves exact behavior: a filter with "sender=X AND subject=Y"
     stays as an AND group, and is NOT flattened into an OR with other conditions.
     """
-    # Group filters by their action key
-    groups: Dict[str, List[ProtonMailFilter]] = {}
-
-    for f in filters:
-        key = _actions_key(f.actions)
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(f)
-
-    consolidated = []
-
-    for action_key, group in groups.items():
-        if len(group) == 1:
-            f = group[0]
-            consolidated.append(ConsolidatedFilter(
-                name=f.name,
-                condition_groups=[ConditionGroup(logic=f.logic, conditions=f.conditions)],
-                actions=f.actions,
-                source_filters=[f.name],
-                filter_count=1,
-            ))
-        else:
-            # Each filter becomes its own condition group, preserving its logic
-            condition_groups = []
-            source_names = []
-
-            for f in group:
-                condition_groups.append(ConditionGroup(
-                    logic=f.logic,
-                    conditions=f.conditions,
-                ))
-                source_names.append(f.name)
-
-            action_desc = _describe_actions(group[0].actions)
-            name = f"{action_desc} (consolidated from {len(group)} filters)"
-
-            consolidated.append(ConsolidatedFilter(
-                name=name,
-                condition_groups=condition_groups,
-                actions=group[0].actions,
-                source_filters=source_names,
-                filter_count=len(group),
-            ))
+    consolidated = [build_consolidated(group) for group in group_filters(filters).values()]
 
     logger.info("Grouped %d filters into %d consolidated filters", len(filters), len(consolidated))
     return consolidated
@@ -82,22 +73,39 @@ def group_by_action(filters: List[ProtonMailFilter]) -> List[ConsolidatedFilter]
 
 def _describe_actions(actions: List[FilterAction]) -> str:
     """Create a human-readable description of actions."""
+    return _describe_action_keys(tuple(a.key for a in actions))
+
+
+# Descriptions for actions without parameters, and (parameter names, template)
+# for those that name a destination. ActionType is a str enum, so these also
+# match the plain type values stored in FilterAction.key.
+_ACTION_DESC_STATIC = {
+    ActionType.MARK_READ: "Mark as read",
+    ActionType.STAR: "Star",
+    ActionType.ARCHIVE: "Archive",
+    ActionType.DELETE: "Delete",
+}
+_ACTION_DESC_PARAM = {
+    ActionType.MOVE_TO: (("folder",), "Move to {}"),
+    ActionType.LABEL: (("label", "folder"), "Label {}"),
+}
+
+
+@lru_cache(maxsize=1024)
+def _describe_action_keys(action_keys: tuple) -> str:
+    """Describe actions given their FilterAction.key tuples, in action order."""
     parts = []
-    for a in actions:
-        if a.type == ActionType.MOVE_TO:
-            folder = a.parameters.get("folder", "?")
-            parts.append(f"Move to {folder}")
-        elif a.type == ActionType.LABEL:
-            label = a.parameters.get("label", a.parameters.get("folder", "?"))
-            parts.append(f"Label {label}")
-        elif a.type == ActionType.MARK_READ:
-            parts.append("Mark as read")
-        elif a.type == ActionType.STAR:
-            parts.append("Star")
-        elif a.type == ActionType.ARCHIVE:
-            parts.append("Archive")
-        elif a.type == ActionType.DELETE:
-            parts.append("Delete")
-        else:
-            parts.append(str(a.type.value))
+    for action_type, params in action_keys:
+        static = _ACTION_DESC_STATIC.get(action_type)
+        if static is not None:
+            parts.append(static)
+            continue
+        param_desc = _ACTION_DESC_PARAM.get(action_type)
+        if param_desc is None:
+            parts.append(str(action_type))
+            continue
+        names, template = param_desc
+        parameters = dict(params)
+        value = next((parameters[n] for n in names if n in parameters), "?")
+        parts.append(template.format(value))
     return " + ".join(parts) if parts else "Unknown action"
@@ -1,6 +1,7 @@
 """Strategy: Merge compatible single-condition groups into array format."""
 
 import logging
+from collections import defaultdict
 from typing import List, Dict
 
 from src.models.filter_models import (
@@ -10,6 +11,57 @@ from src.models.filter_models import (
 logger = logging.getLogger(__name__)
 
 
+def merge_condition_groups(condition_groups: List[ConditionGroup]) -> List[ConditionGroup]:
+    """Merge compatible single-condition groups; see merge_conditions.
+
+    Merged single-condition groups come first, followed by the untouched
+    multi-condition groups. If that leaves the groups exactly as they were,
+    the input list itself is returned.
+    """
+    if len(condition_groups) <= 1:
+        return condition_groups
+
+    # Separate single-condition groups from multi-condition groups
+    single_groups: Dict[tuple, List[ConditionGroup]] = defaultdict(list)
+    multi_groups: List[ConditionGroup] = []
+    reordered = False  # a single-condition group follows a multi-condition one
+
+    for group in condition_groups:
+        if len(group.conditions) == 1:
+            cond = group.conditions[0]
+            single_groups[(cond.type, cond.operator)].append(group)
+            reordered = reordered or bool(multi_groups)
+        else:
+            # Multi-condition group: preserve as-is
+            multi_groups.append(group)
+
+    # Nothing to merge and nothing moves: hand back the input untouched
+    if not reordered and len(single_groups) + len(multi_groups) == len(condition_groups):
+        return condition_groups
+
+    # Merge compatible single-condition groups
+    merged_groups = []
+    for key, groups in single_groups.items():
+        if len(groups) == 1:
+            merged_groups.append(groups[0])
+        else:
+            # Keep the values as a list for Sieve array expansion, dropping
+            # duplicates (first occurrence wins, order preserved); value gets
+            # a pipe-joined copy for display
+            values = list(dict.fromkeys(g.conditions[0].value for g in groups if g.conditions[0].value))
+            merged_groups.append(ConditionGroup(
+                logic=groups[0].logic,
+                conditions=[FilterCondition(
+                    type=groups[0].conditions[0].type,
+                    operator=groups[0].conditions[0].operator,
+                    value="|".join(values),
+                    values=values,
+                )],
+            ))
+
+    return merged_groups + multi_groups
+
+
 def merge_conditions(filters: List[ConsolidatedFilter]) -> List[ConsolidatedFilter]:
     """Merge compatible condition groups within each consolidated filter.
 
@@ -26,53 +78,29 @@ def merge_conditions(filters: List[ConsolidatedFilter]) -> List[ConsolidatedFilt
         Group 1: sender contains "alice" AND subject contains "urgent"
         Group 2: sender contains "bob"
         → Left as-is (two separate groups)
+
+    If no filter changes (nothing to merge), the input list is returned as-is.
     """
     result = []
+    any_merged = False
 
     for f in filters:
-        if len(f.condition_groups) <= 1:
+        merged = merge_condition_groups(f.condition_groups)
+        if merged is f.condition_groups:
+            # No change: reuse the filter rather than rebuilding it
             result.append(f)
             continue
-
-        # Separate single-condition groups from multi-condition groups
-        single_groups: Dict[str, List[ConditionGroup]] = {}
-        multi_groups: List[ConditionGroup] = []
-
-        for group in f.condition_groups:
-            if len(group.conditions) == 1:
-                cond = group.conditions[0]
-                key = f"{cond.type.value}|{cond.operator.value}"
-                if key not in single_groups:
-                    single_groups[key] = []
-                single_groups[key].append(group)
-            else:
-                # Multi-condition group: preserve as-is
-                multi_groups.append(group)
-
-        # Merge compatible single-condition groups
-        merged_groups = []
-        for key, groups in single_groups.items():
-            if len(groups) == 1:
-                merged_groups.append(groups[0])
-            else:
-                # Combine values with pipe delimiter for Sieve array expansion
-                values = [g.conditions[0].value for g in groups if g.conditions[0].value]
-                merged_groups.append(ConditionGroup(
-                    logic=groups[0].logic,
-                    conditions=[FilterCondition(
-                        type=groups[0].conditions[0].type,
-                        operator=groups[0].conditions[0].operator,
-                        value="|".join(values),
-                    )],
-                ))
-
+        any_merged = True
         result.append(ConsolidatedFilter(
             name=f.name,
-            condition_groups=merged_groups + multi_groups,
+            condition_groups=merged,
             actions=f.actions,
             source_filters=f.source_filters,
             filter_count=f.filter_count,
         ))
 
+    if not any_merged:
+        return filters
+
     logger.info("Merged conditions in %d consolidated filters", len(result))
     return result
@@ -1,22 +1,15 @@
 """Strategy: Optimize filter ordering for efficiency."""
 
 import logging
+from itertools import pairwise
 from typing import List
 
-from src.models.filter_models import ConsolidatedFilter, ActionType
+# ACTION_PRIORITY lives with the models (ConsolidatedFilter.min_priority);
+# it is re-exported here for existing importers
+from src.models.filter_models import ConsolidatedFilter, ACTION_PRIORITY
 
 logger = logging.getLogger(__name__)
 
-# Priority ordering: lower number = higher priority (evaluated first)
-ACTION_PRIORITY = {
-    ActionType.DELETE: 0,      # Spam/delete first (most common, stops processing)
-    ActionType.ARCHIVE: 1,     # Archive next
-    ActionType.MOVE_TO: 2,     # Folder routing
-    ActionType.LABEL: 3,       # Labeling
-    ActionType.MARK_READ: 4,   # Mark as read
-    ActionType.STAR: 5,        # Star
-}
-
 
 def optimize_ordering(filters: List[ConsolidatedFilter]) -> List[ConsolidatedFilter]:
     """Sort consolidated filters by priority.
@@ -24,16 +17,20 @@ def optimize_ordering(filters: List[ConsolidatedFilter]) -> List[ConsolidatedFil
     Delete/spam rules come first (most impactful, can stop processing).
     Then folder moves, labels, etc.
     Also sorts by filter count (more consolidated = higher priority within same action type).
+
+    Input that is already in order is returned as-is (the same list object).
     """
-    def sort_key(f: ConsolidatedFilter):
-        # Get the highest priority action in this filter
-        min_priority = 99
-        for action in f.actions:
-            p = ACTION_PRIORITY.get(action.type, 10)
-            min_priority = min(min_priority, p)
-        # Secondary sort by filter count (more consolidated = earlier)
-        return (min_priority, -f.filter_count)
-
-    sorted_filters = sorted(filters, key=sort_key)
+    if len(filters) <= 1:
+        return filters
+
+    # Build every sort key up front: the highest-priority action in the filter
+    # (cached on the filter), then filter count (more consolidated = earlier). Sorting indices by the
+    # key list keeps the sort stable and never compares the filters themselves.
+    keys = [(f.min_priority, -f.filter_count) for f in filters]
+    if all(a <= b for a, b in pairwise(keys)):
+        logger.info("Ordering already optimal for %d filters", len(filters))
+        return filters
+    order = sorted(range(len(filters)), key=keys.__getitem__)
+    sorted_filters = [filters[i] for i in order]
     logger.info("Optimized ordering for %d filters", len(sorted_filters))
     return sorted_filters
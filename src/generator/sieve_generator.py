@@ -151,8 +151,12 @@ class SieveGenerator:
         """Convert a single condition to Sieve syntax."""
         comparator = self._operator_to_sieve(cond.operator)
 
-        # Handle pipe-delimited values (from merge_conditions strategy)
-        raw_values = cond.value.split("|") if "|" in cond.value else [cond.value]
+        # Merged conditions carry their values as a list; older inputs may
+        # still use pipe-delimited values
+        if cond.values:
+            raw_values = cond.values
+        else:
+            raw_values = cond.value.split("|") if "|" in cond.value else [cond.value]
 
         # Also split comma-separated values within each entry.
         # ProtonMail stores multiple values in a single condition field
@@ -1,30 +1,25 @@
 """CLI entry point for ProtonFusion."""
 
-import asyncio
-import difflib
-import json
 import logging
-import sys
-from datetime import datetime, timezone
+from collections import Counter
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich import print as rprint
+from rich.text import Text
 
-from src.utils.config import (
-    load_credentials, SNAPSHOTS_DIR, TOOL_VERSION,
-)
-from src.models.filter_models import ProtonMailFilter, FilterStatus
-from src.models.backup_models import Backup, ArchiveEntry
-from src.backup.backup_manager import BackupManager
-from src.backup.diff_engine import DiffEngine
-from src.parser.filter_parser import parse_scraped_filters
-from src.consolidator.consolidation_engine import ConsolidationEngine
-from src.generator.sieve_generator import SieveGenerator, SECTION_BEGIN
+from src.utils.config import load_credentials
+from src.models.enums import FilterStatus
+
+# Everything else is imported inside the commands that use it, so startup
+# (and --help) only pays for typer, rich's console and the filter enums;
+# the enums live apart from the pydantic models to keep pydantic out too
+if TYPE_CHECKING:
+    from src.backup.backup_manager import BackupManager
+    from src.backup.diff_engine import DiffEngine
+    from src.models.backup_models import ArchiveEntry, Backup
+    from src.models.filter_models import ProtonMailFilter
 
 SIEVE_FILTER_NAME = "ProtonFusion Consolidated"
 
@@ -37,16 +32,24 @@ app = typer.Typer(
 snapshot_app = typer.Typer(help="Manage snapshot contents.")
 app.add_typer(snapshot_app, name="snapshot")
 console = Console()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    datefmt="%H:%M:%S",
-)
 logger = logging.getLogger(__name__)
 
 
+def _configure_logging():
+    """Configure logging; called once a command actually runs, not for --help."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+
+@app.callback()
+def main():
+    """ProtonFusion - safely consolidate your ProtonMail filters into Sieve scripts."""
+    _configure_logging()
+
+
 def _get_credentials(credentials_file: str, manual_login: bool):
     """Load credentials if applicable."""
     if manual_login:
@@ -56,6 +59,66 @@ def _get_credentials(credentials_file: str, manual_login: bool):
     return None
 
 
+async def _prepare_session(client) -> None:
+    """Start the browser, log in and open the filters page under one status line.
+
+    Works for both ProtonMailScraper and ProtonMailSync.
+    """
+    with console.status("[bold green]Initializing browser...") as status:
+        await client.initialize()
+        status.update("[bold green]Logging in...")
+        await client.login()
+        status.update("[bold green]Navigating to filters...")
+        await client.navigate_to_filters()
+
+
+def _recent_latest_backup(manager: "BackupManager", max_age: int) -> "Optional[Backup]":
+    """Return the latest backup if it is at most max_age seconds old, else None.
+
+    A snapshot taken moments ago describes the account well enough to stand
+    in for a fresh read, unless this tool has changed the account since
+    (sync, restore, cleanup). max_age <= 0 disables this.
+    """
+    if max_age <= 0:
+        return None
+    age = manager.latest_snapshot_age()
+    if age is None or age > max_age:
+        return None
+    if manager.written_since_latest():
+        console.print("[yellow]Account was changed after the latest snapshot; reading it live")
+        return None
+    console.print(f"[cyan]Latest snapshot is {age:.0f}s old (--max-snapshot-age {max_age})")
+    return manager.load_backup("latest")
+
+
+def _is_latest(manager: "BackupManager", backup_id: str) -> bool:
+    """Whether backup_id names the same snapshot as 'latest'."""
+    try:
+        return manager.snapshot_dir_for(backup_id) == manager.snapshot_dir_for("latest")
+    except FileNotFoundError:
+        return False
+
+
+def _head_lines(text: str, n: int) -> str:
+    """Return the first n lines of text, without splitting the rest of it."""
+    end = -1
+    for _ in range(n):
+        end = text.find("\n", end + 1)
+        if end == -1:
+            return text
+    return text[:end]
+
+
+def _run_async(coro):
+    """Run a command's coroutine to completion, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:  # optional speedup; not available on Windows
+        import asyncio
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 @app.command()
 def backup(
     headless: bool = typer.Option(False, "--headless", help="Run browser in headless mode"),
@@ -63,9 +126,15 @@ def backup(
     manual_login: bool = typer.Option(False, "--manual-login", help="Force manual login"),
     output: str = typer.Option("", "--output", help="Custom output path for backup file"),
     workers: int = typer.Option(5, "--workers", "-w", help="Parallel browser tabs for scraping (1=sequential, max 10)"),
+    browsers: int = typer.Option(1, "--browsers", help="Browser instances to spread scraping tabs over (1=one browser)"),
+    skip_unchanged: bool = typer.Option(False, "--skip-unchanged", help="Don't create a snapshot if nothing changed since the latest one"),
 ):
     """Scrape current filters and save to a timestamped snapshot."""
+    from rich.panel import Panel
     from src.scraper.protonmail_scraper import ProtonMailScraper
+    from src.backup.backup_manager import BackupManager
+    from src.parser.filter_parser import parse_scraped_filters
+    from src.generator.sieve_generator import SECTION_BEGIN
 
     creds = _get_credentials(credentials_file, manual_login)
     workers = max(1, min(workers, 10))
@@ -73,20 +142,13 @@ def backup(
     async def _run():
         scraper = ProtonMailScraper(headless=headless, credentials=creds)
         try:
-            with console.status("[bold green]Initializing browser..."):
-                await scraper.initialize()
-
-            with console.status("[bold green]Logging in..."):
-                await scraper.login()
-
-            with console.status("[bold green]Navigating to filters..."):
-                await scraper.navigate_to_filters()
+            await _prepare_session(scraper)
 
             if workers > 1:
                 console.print(f"[bold green]Scraping filters with {workers} parallel tabs...")
             else:
                 console.print("[bold green]Scraping filters...")
-            raw_filters = await scraper.scrape_all_filters(workers=workers)
+            raw_filters = await scraper.scrape_all_filters(workers=workers, browsers=browsers)
             console.print(f"[green]Scraped {len(raw_filters)} filters")
 
             with console.status("[bold green]Reading existing Sieve script..."):
@@ -99,6 +161,14 @@ def backup(
 
             # Create backup
             manager = BackupManager()
+            if skip_unchanged:
+                unchanged = manager.unchanged_latest(filters, sieve_script)
+                if unchanged:
+                    console.print(Panel(
+                        f"[bold green]No changes since snapshot {unchanged}[/]\nNo new snapshot created.",
+                        title="Backup Skipped",
+                    ))
+                    return
             bkup = manager.create_backup(
                 filters,
                 account_email=scraper.account_email,
@@ -119,14 +189,14 @@ def backup(
                         "[yellow]Warning: existing script has no ProtonFusion markers.[/]\n"
                         "[yellow]Running 'sync' will wrap it outside the managed section.[/]"
                     )
-                preview = "\n".join(sieve_script.split("\n")[:5])
+                preview = _head_lines(sieve_script, 5)
                 backup_lines.append(f"\n[dim]Preview:[/]\n[dim]{preview}[/]")
 
             console.print(Panel("\n".join(backup_lines), title="Backup Complete"))
         finally:
             await scraper.close()
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -135,6 +205,7 @@ def show(
     credentials_file: str = typer.Option("", "--credentials-file", help="Path to credentials file"),
     manual_login: bool = typer.Option(False, "--manual-login", help="Force manual login"),
     workers: int = typer.Option(5, "--workers", "-w", help="Parallel browser tabs for scraping (1=sequential, max 10)"),
+    browsers: int = typer.Option(1, "--browsers", help="Browser instances to spread scraping tabs over (1=one browser)"),
 ):
     """Read and display your current filters (read-only, no changes made).
 
@@ -142,6 +213,7 @@ def show(
     read your filters before running any other commands.
     """
     from src.scraper.protonmail_scraper import ProtonMailScraper
+    from src.parser.filter_parser import parse_scraped_filters
 
     creds = _get_credentials(credentials_file, manual_login)
     workers = max(1, min(workers, 10))
@@ -149,18 +221,11 @@ def show(
     async def _run():
         scraper = ProtonMailScraper(headless=headless, credentials=creds)
         try:
-            with console.status("[bold green]Initializing browser..."):
-                await scraper.initialize()
-
-            with console.status("[bold green]Logging in..."):
-                await scraper.login()
-
-            with console.status("[bold green]Navigating to filters..."):
-                await scraper.navigate_to_filters()
+            await _prepare_session(scraper)
 
             if workers > 1:
                 console.print(f"[bold green]Scraping filters with {workers} parallel tabs...")
-            raw_filters = await scraper.scrape_all_filters(workers=workers)
+            raw_filters = await scraper.scrape_all_filters(workers=workers, browsers=browsers)
 
             filters = parse_scraped_filters(raw_filters)
             _display_filters(filters)
@@ -168,7 +233,7 @@ def show(
         finally:
             await scraper.close()
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command("show-backup")
@@ -176,6 +241,9 @@ def show_backup(
     backup_id: str = typer.Option("latest", "--backup", help="Backup identifier (timestamp or 'latest')"),
 ):
     """Display filters from a backup file (offline, no login needed)."""
+    from src.backup.backup_manager import BackupManager
+    from src.generator.sieve_generator import SECTION_BEGIN
+
     manager = BackupManager()
     bkup = manager.load_backup(backup_id)
     _display_filters(bkup.filters, source=f"backup '{backup_id}'")
@@ -185,29 +253,70 @@ def show_backup(
         console.print(f"[cyan]ProtonFusion markers: {'yes' if has_markers else 'no'}")
 
 
-_STATUS_DISPLAY = {
-    FilterStatus.ENABLED: "[green]enabled[/]",
-    FilterStatus.DISABLED: "[yellow]disabled[/]",
-    FilterStatus.ARCHIVED: "[cyan]archived[/]",
-    FilterStatus.DEPRECATED: "[dim]deprecated[/]",
+# Name cell color in snapshot view, by status
+_STATUS_NAME_STYLE = {
+    FilterStatus.ENABLED: "green",
+    FilterStatus.DISABLED: "yellow",
+    FilterStatus.ARCHIVED: "cyan",
+    FilterStatus.DEPRECATED: "dim",
 }
 
+# Summary order and colors for status counts
+_STATUS_SUMMARY = (
+    (FilterStatus.ENABLED, "Enabled", "green"),
+    (FilterStatus.DISABLED, "Disabled", "yellow"),
+    (FilterStatus.ARCHIVED, "Archived", "cyan"),
+    (FilterStatus.DEPRECATED, "Deprecated", "dim"),
+)
+
+# Table cells are passed as Text, not markup strings: Rich then skips its
+# markup parser per cell, and brackets in filter names or values print as-is
+_STATUS_CELLS = {status: Text(status.value, style=color) for status, _, color in _STATUS_SUMMARY}
+_NONE_CELL = Text("none", style="dim")
+
+# Markup for unified diff lines, keyed by first character; the +++/--- file
+# headers are checked separately since they share a prefix with hunk lines
+_DIFF_LINE_FORMATS = {"@": "[cyan]{}[/cyan]", "+": "[green]{}[/green]", "-": "[red]{}[/red]"}
+
+# Separator between displayed conditions, by LogicType value
+_LOGIC_SEP = {"and": " AND ", "or": " OR "}
+
+
+def _format_conditions(f: "ProtonMailFilter") -> Text:
+    """Render a filter's conditions for a table cell."""
+    if not f.conditions:
+        return _NONE_CELL
+    return Text(_LOGIC_SEP[f.logic.value].join(
+        f"{c.type.value} {c.operator.value} \"{c.value}\"" for c in f.conditions
+    ))
+
+
+def _format_actions(f: "ProtonMailFilter") -> Text:
+    """Render a filter's actions for a table cell."""
+    if not f.actions:
+        return _NONE_CELL
+    return Text(", ".join(
+        f"{a.type.value}({', '.join(map(str, a.parameters.values()))})" if a.parameters else a.type.value
+        for a in f.actions
+    ))
+
 
 def _display_filters(filters: list, source: str = "ProtonMail account"):
     """Display a list of filters in a readable table."""
+    from rich.panel import Panel
+    from rich.table import Table
+
     if not filters:
         console.print(f"[yellow]No filters found in {source}.")
         return
 
-    counts = {}
-    for f in filters:
-        counts[f.status.value] = counts.get(f.status.value, 0) + 1
+    counts = Counter(f.status for f in filters)
 
     summary_parts = [f"[bold]Found {len(filters)} filters[/] in {source}"]
-    for status_val, color in [("enabled", "green"), ("disabled", "yellow"), ("archived", "cyan"), ("deprecated", "dim")]:
-        count = counts.get(status_val, 0)
+    for status, label, color in _STATUS_SUMMARY:
+        count = counts[status]
         if count > 0:
-            summary_parts.append(f"{status_val.title()}: [{color}]{count}[/]")
+            summary_parts.append(f"{label}: [{color}]{count}[/]")
 
     console.print(Panel(
         "\n".join(summary_parts[:1]) + "\n" + "  ".join(summary_parts[1:]),
@@ -222,25 +331,7 @@ def _display_filters(filters: list, source: str = "ProtonMail account"):
     table.add_column("Actions", max_width=30)
 
     for i, f in enumerate(filters, 1):
-        status = _STATUS_DISPLAY.get(f.status, str(f.status.value))
-
-        # Format conditions
-        cond_parts = []
-        for c in f.conditions:
-            cond_parts.append(f"{c.type.value} {c.operator.value} \"{c.value}\"")
-        conds_str = f" {f.logic.value.upper()} ".join(cond_parts) if cond_parts else "[dim]none[/]"
-
-        # Format actions
-        action_parts = []
-        for a in f.actions:
-            if a.parameters:
-                params = ", ".join(f"{v}" for v in a.parameters.values())
-                action_parts.append(f"{a.type.value}({params})")
-            else:
-                action_parts.append(a.type.value)
-        actions_str = ", ".join(action_parts) if action_parts else "[dim]none[/]"
-
-        table.add_row(str(i), f.name, status, conds_str, actions_str)
+        table.add_row(Text(str(i)), Text(f.name), _STATUS_CELLS[f.status], _format_conditions(f), _format_actions(f))
 
     console.print(table)
 
@@ -248,6 +339,10 @@ def _display_filters(filters: list, source: str = "ProtonMail account"):
 @app.command("list-snapshots")
 def list_snapshots():
     """Show all available snapshots with statistics."""
+    from concurrent.futures import ThreadPoolExecutor
+    from rich.table import Table
+    from src.backup.backup_manager import BackupManager, LIST_BACKUPS_WORKERS
+
     manager = BackupManager()
     backups = manager.list_backups()
 
@@ -264,12 +359,12 @@ def list_snapshots():
     table.add_column("Archived", justify="right", style="cyan")
     table.add_column("Size", justify="right")
 
-    for b in backups:
+    # Archive files are independent reads; load them concurrently
+    with ThreadPoolExecutor(max_workers=min(LIST_BACKUPS_WORKERS, len(backups))) as pool:
+        archived_counts = list(pool.map(lambda b: len(manager.load_archive(Path(b["path"]))), backups))
+
+    for b, archived_count in zip(backups, archived_counts):
         size_kb = b["size_bytes"] / 1024
-        # Load archive count for this snapshot
-        snapshot_path = Path(b["path"])
-        archive_entries = manager.load_archive(snapshot_path)
-        archived_count = len(archive_entries)
         table.add_row(
             b["snapshot"],
             b["timestamp"][:19] if b["timestamp"] else "?",
@@ -296,6 +391,11 @@ def analyze(
     include_disabled: bool = typer.Option(False, "--include-disabled", help="Include disabled filters in analysis"),
 ):
     """Analyze filter patterns and consolidation opportunities."""
+    from rich.panel import Panel
+    from rich.table import Table
+    from src.backup.backup_manager import BackupManager
+    from src.consolidator.consolidation_engine import ConsolidationEngine
+
     manager = BackupManager()
     bkup = manager.load_backup(backup_id)
 
@@ -357,21 +457,27 @@ def consolidate(
     include_args_from: str = typer.Option("", "--include-args-from", help="Load previous consolidation_args.json from snapshot"),
 ):
     """Generate optimized Sieve script from backup (local only, no ProtonMail changes)."""
+    from datetime import datetime, timezone
+    from rich.panel import Panel
+    from src.backup.backup_manager import BackupManager
+    from src.models.backup_models import ArchiveEntry
+    from src.consolidator.consolidation_engine import ConsolidationEngine
+    from src.generator.sieve_generator import SieveGenerator
+
     manager = BackupManager()
     bkup = manager.load_backup(backup_id)
     snapshot_dir = manager.snapshot_dir_for(backup_id)
 
     # Build exclude set from CLI args + loaded args
-    exclude_names: set[str] = set(exclude) if exclude else set()
+    saved_excludes: List[str] = []
     if include_args_from:
-        args_dir = manager.snapshot_dir_for(include_args_from)
-        args_path = args_dir / "consolidation_args.json"
-        if args_path.exists():
-            saved_args = json.loads(args_path.read_text())
-            exclude_names.update(saved_args.get("exclude", []))
-            console.print(f"[cyan]Loaded args from {include_args_from}: +{len(saved_args.get('exclude', []))} excludes")
+        saved_args = manager.load_consolidation_args(manager.snapshot_dir_for(include_args_from))
+        if saved_args is not None:
+            saved_excludes = saved_args.get("exclude", [])
+            console.print(f"[cyan]Loaded args from {include_args_from}: +{len(saved_excludes)} excludes")
         else:
             console.print(f"[yellow]No consolidation_args.json found in {include_args_from}")
+    exclude_names = frozenset([*(exclude or ()), *saved_excludes])
 
     # Load archive entries and separate by status
     archive_entries = manager.load_archive(snapshot_dir)
@@ -381,19 +487,18 @@ def consolidate(
     ]
 
     # Apply archive status overrides to backup filters
-    archive_by_hash = {e.filter.content_hash: e for e in archive_entries}
-    backup_filters = []
-    for f in bkup.filters:
-        if f.content_hash in archive_by_hash:
-            # Archive entry overrides this backup filter's status
-            override = archive_by_hash[f.content_hash]
-            if override.filter.status == FilterStatus.ARCHIVED:
-                continue  # Already in archived_filters
-            if override.filter.status == FilterStatus.DEPRECATED:
-                continue  # Will be skipped
-            backup_filters.append(override.filter)
-        else:
-            backup_filters.append(f)
+    archive_filter_by_hash = {e.filter.content_hash: e.filter for e in archive_entries}
+    # Archived entries are already in archived_filters and deprecated ones are
+    # skipped; any other archive entry replaces the backup filter outright
+    skip_hashes = {
+        h for h, af in archive_filter_by_hash.items()
+        if af.status in (FilterStatus.ARCHIVED, FilterStatus.DEPRECATED)
+    }
+    override_map = {h: af for h, af in archive_filter_by_hash.items() if h not in skip_hashes}
+    backup_filters = [
+        override_map.get(f.content_hash, f) for f in bkup.filters
+        if f.content_hash not in skip_hashes
+    ]
 
     if archived_filters:
         console.print(f"[cyan]Including {len(archived_filters)} archived filters from archive")
@@ -423,7 +528,7 @@ def consolidate(
     else:
         out_path = snapshot_dir / "consolidated.sieve"
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(sieve_script)
+    out_path.write_bytes(sieve_script.encode("utf-8"))
     console.print(f"[green]Sieve script saved to: {out_path}")
 
     # Collect all processed filters and write manifest into snapshot dir
@@ -435,13 +540,14 @@ def consolidate(
     manager.write_manifest(snapshot_dir, processed_filters, str(out_path))
     console.print(f"[cyan]Manifest written to snapshot ({len(processed_filters)} filters)")
 
-    # Post-consolidation archiving: move included backup filters to archive
+    # Post-consolidation archiving: move included backup filters to archive.
+    # processed_filters already holds exactly the included filters; the ones
+    # whose hash is in the archive (overrides, archived) are there already.
     now_ts = datetime.now(timezone.utc).isoformat()
-    for f in bkup.filters:
-        if f.name in all_source_names and f.content_hash not in archive_by_hash:
-            archived_f = f.model_copy(deep=True)
-            archived_f.status = FilterStatus.ARCHIVED
-            archived_f.enabled = False
+    for f in processed_filters:
+        if f.content_hash not in archive_filter_by_hash:
+            # Shallow copy: only status/enabled change, nested fields are shared read-only
+            archived_f = f.model_copy(update={"status": FilterStatus.ARCHIVED, "enabled": False})
             archive_entries.append(ArchiveEntry(
                 filter=archived_f,
                 archived_at=now_ts,
@@ -451,11 +557,11 @@ def consolidate(
 
     # Save consolidation_args.json
     args_data = {
-        "exclude": sorted(exclude_names) if exclude_names else [],
+        "exclude": sorted(exclude_names),
         "include_disabled": include_disabled,
         "created_at": now_ts,
     }
-    (snapshot_dir / "consolidation_args.json").write_text(json.dumps(args_data, indent=2))
+    manager.write_consolidation_args(snapshot_dir, args_data)
 
     # Build report display
     report_lines = [
@@ -478,7 +584,7 @@ def consolidate(
     if len(sieve_script) < 3000:
         console.print(Panel(sieve_script, title="Generated Sieve Script", border_style="blue"))
     else:
-        preview = "\n".join(sieve_script.split("\n")[:30])
+        preview = _head_lines(sieve_script, 30)
         console.print(Panel(preview + "\n...", title="Sieve Script Preview (first 30 lines)", border_style="blue"))
 
 
@@ -490,8 +596,12 @@ def diff(
     headless: bool = typer.Option(False, "--headless", help="Run browser in headless mode"),
     credentials_file: str = typer.Option("", "--credentials-file", help="Credentials file"),
     workers: int = typer.Option(5, "--workers", "-w", help="Parallel browser tabs for scraping (1=sequential, max 10)"),
+    browsers: int = typer.Option(1, "--browsers", help="Browser instances to spread scraping tabs over (1=one browser)"),
 ):
     """Compare backups or current state vs backup."""
+    from src.backup.backup_manager import BackupManager
+    from src.backup.diff_engine import DiffEngine
+
     manager = BackupManager()
     diff_engine = DiffEngine()
 
@@ -503,32 +613,43 @@ def diff(
 
     elif backup_id:
         from src.scraper.protonmail_scraper import ProtonMailScraper
+        from src.parser.filter_parser import parse_scraped_filters
 
         creds = _get_credentials(credentials_file, False)
         _workers = max(1, min(workers, 10))
-        bkup = manager.load_backup(backup_id)
+        # Resolve up front so an unknown snapshot fails before the browser starts
+        manager.snapshot_dir_for(backup_id)
 
         async def _run():
+            import asyncio
+
             scraper = ProtonMailScraper(headless=headless, credentials=creds)
+            # Parse the backup on a thread while the browser spins up
+            bkup_task = asyncio.create_task(asyncio.to_thread(manager.load_backup, backup_id))
             try:
-                await scraper.initialize()
-                await scraper.login()
-                await scraper.navigate_to_filters()
-                raw_filters = await scraper.scrape_all_filters(workers=_workers)
+                await _prepare_session(scraper)
+                bkup = await bkup_task
+                raw_filters = await scraper.scrape_all_filters(workers=_workers, browsers=browsers)
                 current_filters = parse_scraped_filters(raw_filters)
                 result = diff_engine.compare_filter_lists(bkup.filters, current_filters)
                 _display_diff(result, diff_engine, f"Diff: {backup_id} vs Current")
             finally:
+                # If the session failed first, the load is still pending or its error unretrieved
+                bkup_task.cancel()
+                await asyncio.gather(bkup_task, return_exceptions=True)
                 await scraper.close()
 
-        asyncio.run(_run())
+        _run_async(_run())
     else:
         console.print("[red]Provide --backup (compare vs current) or --backup1/--backup2 (compare two backups)")
         raise typer.Exit(1)
 
 
-def _display_diff(diff_result, diff_engine: DiffEngine, title: str):
+def _display_diff(diff_result, diff_engine: "DiffEngine", title: str):
     """Display diff results with colors."""
+    from rich.panel import Panel
+    from rich.table import Table
+
     summary = diff_engine.generate_summary(diff_result)
 
     if summary["total_changes"] == 0:
@@ -545,30 +666,35 @@ def _display_diff(diff_result, diff_engine: DiffEngine, title: str):
     table.add_row("Unchanged", str(summary["unchanged"]))
     console.print(table)
 
-    if diff_result.added:
+    # Each section lists up to 10 filters; counts come from the summary
+    if summary["added"]:
         console.print("\n[bold green]Added filters:")
         for f in diff_result.added[:10]:
             console.print(f"  [green]+ {f.name}")
-        if len(diff_result.added) > 10:
-            console.print(f"  ... and {len(diff_result.added) - 10} more")
+        if summary["added"] > 10:
+            console.print(f"  ... and {summary['added'] - 10} more")
 
-    if diff_result.removed:
+    if summary["removed"]:
         console.print("\n[bold red]Removed filters:")
         for f in diff_result.removed[:10]:
             console.print(f"  [red]- {f.name}")
-        if len(diff_result.removed) > 10:
-            console.print(f"  ... and {len(diff_result.removed) - 10} more")
+        if summary["removed"] > 10:
+            console.print(f"  ... and {summary['removed'] - 10} more")
 
-    if diff_result.modified:
+    if summary["modified"]:
         console.print("\n[bold yellow]Modified filters:")
         for old, new in diff_result.modified[:10]:
             console.print(f"  [yellow]~ {old.name}")
+        if summary["modified"] > 10:
+            console.print(f"  ... and {summary['modified'] - 10} more")
 
-    if diff_result.state_changed:
+    if summary["state_changed"]:
         console.print("\n[bold blue]State changed:")
         for old, new in diff_result.state_changed[:10]:
             state = "enabled" if new.enabled else "disabled"
             console.print(f"  [blue]  {old.name} -> {state}")
+        if summary["state_changed"] > 10:
+            console.print(f"  ... and {summary['state_changed'] - 10} more")
 
 
 @app.command()
@@ -579,9 +705,14 @@ def sync(
     credentials_file: str = typer.Option("", "--credentials-file", help="Credentials file"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Preview changes without applying"),
     show_diff_only: bool = typer.Option(False, "--show-diff-only", help="Log in, fetch live Sieve, show diff, change nothing"),
+    max_snapshot_age: int = typer.Option(0, "--max-snapshot-age", help="Use the latest snapshot's Sieve script as the live one if at most this many seconds old (0=always read it)"),
 ):
     """Upload Sieve script and disable old UI filters (reversible)."""
+    import difflib
+    from rich.panel import Panel
     from src.scraper.protonmail_sync import ProtonMailSync
+    from src.backup.backup_manager import BackupManager
+    from src.generator.sieve_generator import SieveGenerator, SECTION_BEGIN
 
     manager = BackupManager()
     snapshot_dir = manager.snapshot_dir_for(backup_id)
@@ -598,8 +729,7 @@ def sync(
             console.print("[yellow]Run 'consolidate' first, or provide --sieve explicitly.")
         raise typer.Exit(1)
 
-    sieve_script = sieve_path.read_text()
-    creds = _get_credentials(credentials_file, False)
+    sieve_script = sieve_path.read_text(encoding="utf-8")
     bkup = manager.load_backup(backup_id)
 
     if dry_run:
@@ -616,17 +746,18 @@ def sync(
             if len(merged) < 3000:
                 console.print(Panel(merged, title="Merged Script Preview", border_style="cyan"))
             else:
-                preview = "\n".join(merged.split("\n")[:40])
+                preview = _head_lines(merged, 40)
                 console.print(Panel(preview + "\n...", title="Merged Script Preview (first 40 lines)", border_style="cyan"))
         return
 
+    # Credentials are only needed once we actually log in
+    creds = _get_credentials(credentials_file, False)
+
     if show_diff_only:
         async def _show_diff():
             sync_client = ProtonMailSync(headless=headless, credentials=creds)
             try:
-                await sync_client.initialize()
-                await sync_client.login()
-                await sync_client.navigate_to_filters()
+                await _prepare_session(sync_client)
 
                 with console.status("[bold green]Reading existing Sieve script..."):
                     existing_script = await sync_client.read_sieve_script(
@@ -642,31 +773,25 @@ def sync(
                     console.print(Panel("[bold green]No changes — live script already matches."))
                     return
 
-                diff_lines = list(difflib.unified_diff(
+                # Colorize straight off the diff generator; no intermediate list
+                colored = []
+                for line in difflib.unified_diff(
                     existing_script.splitlines(keepends=True),
                     merged_script.splitlines(keepends=True),
                     fromfile="live (ProtonMail)",
                     tofile="merged (would upload)",
-                ))
+                ):
+                    text = line.rstrip("\n")
+                    if line[:3] in ("+++", "---"):
+                        colored.append(f"[bold]{text}[/bold]")
+                        continue
+                    fmt = _DIFF_LINE_FORMATS.get(line[:1])
+                    colored.append(fmt.format(text) if fmt else text)
 
-                if not diff_lines:
+                if not colored:
                     console.print(Panel("[bold green]No changes — live script already matches."))
                     return
 
-                colored = []
-                for line in diff_lines:
-                    text = line.rstrip("\n")
-                    if line.startswith("+++") or line.startswith("---"):
-                        colored.append(f"[bold]{text}[/bold]")
-                    elif line.startswith("@@"):
-                        colored.append(f"[cyan]{text}[/cyan]")
-                    elif line.startswith("+"):
-                        colored.append(f"[green]{text}[/green]")
-                    elif line.startswith("-"):
-                        colored.append(f"[red]{text}[/red]")
-                    else:
-                        colored.append(text)
-
                 console.print(Panel(
                     "\n".join(colored),
                     title="Sieve Diff (live vs would-upload)",
@@ -675,21 +800,29 @@ def sync(
             finally:
                 await sync_client.close()
 
-        asyncio.run(_show_diff())
+        _run_async(_show_diff())
         return
 
+    # An empty script in the snapshot may just be a failed read, and merging
+    # with "" would drop the user's rules, so only a non-empty one is reused
+    recent = _recent_latest_backup(manager, max_snapshot_age)
+    snapshot_script = recent.sieve_script if recent is not None else ""
+    if snapshot_script:
+        console.print("[cyan]Using its Sieve script as the live one, skipping the read")
+
     async def _run():
         sync_client = ProtonMailSync(headless=headless, credentials=creds)
         try:
-            await sync_client.initialize()
-            await sync_client.login()
-            await sync_client.navigate_to_filters()
+            await _prepare_session(sync_client)
 
             # Read existing script and merge
-            with console.status("[bold green]Reading existing Sieve script..."):
-                existing_script = await sync_client.read_sieve_script(
-                    filter_name=SIEVE_FILTER_NAME,
-                )
+            if snapshot_script:
+                existing_script = snapshot_script
+            else:
+                with console.status("[bold green]Reading existing Sieve script..."):
+                    existing_script = await sync_client.read_sieve_script(
+                        filter_name=SIEVE_FILTER_NAME,
+                    )
 
             if existing_script:
                 console.print(f"[cyan]Found existing Sieve script ({len(existing_script)} chars)")
@@ -703,6 +836,7 @@ def sync(
             # enforces a per-plan limit on active filters, so uploading a new
             # Sieve filter will fail if we're already at the limit).
             console.print("[bold green]Disabling old UI filters...")
+            manager.record_remote_write()
             disabled = await sync_client.disable_all_ui_filters()
             console.print(f"[green]Disabled {disabled} filters")
 
@@ -733,7 +867,7 @@ def sync(
         finally:
             await sync_client.close()
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -742,35 +876,53 @@ def restore(
     headless: bool = typer.Option(False, "--headless", help="Run browser in headless mode"),
     credentials_file: str = typer.Option("", "--credentials-file", help="Credentials file"),
     workers: int = typer.Option(5, "--workers", "-w", help="Parallel browser tabs for scraping (1=sequential, max 10)"),
+    browsers: int = typer.Option(1, "--browsers", help="Browser instances to spread scraping tabs over (1=one browser)"),
+    max_snapshot_age: int = typer.Option(0, "--max-snapshot-age", help="Use the latest snapshot as current state if at most this many seconds old, skipping the scrape (0=always scrape)"),
 ):
     """Restore filters to previous backup state."""
+    from rich.panel import Panel
     from src.scraper.protonmail_scraper import ProtonMailScraper
     from src.scraper.protonmail_sync import ProtonMailSync
+    from src.backup.backup_manager import BackupManager
     from src.backup.restore_engine import RestoreEngine
+    from src.parser.filter_parser import parse_scraped_filters
 
     creds = _get_credentials(credentials_file, False)
     _workers = max(1, min(workers, 10))
     manager = BackupManager()
     bkup = manager.load_backup(backup_id)
 
-    async def _run():
-        scraper = ProtonMailScraper(headless=headless, credentials=creds)
-        try:
-            await scraper.initialize()
-            await scraper.login()
-            await scraper.navigate_to_filters()
-            raw_filters = await scraper.scrape_all_filters(workers=_workers)
-            current_filters = parse_scraped_filters(raw_filters)
-        finally:
-            await scraper.close()
+    # Restoring the latest snapshot would compare it with itself and toggle nothing
+    recent = None
+    if max_snapshot_age > 0 and _is_latest(manager, backup_id):
+        console.print("[yellow]--backup is the latest snapshot, so it can't stand in for current state; scraping")
+    else:
+        recent = _recent_latest_backup(manager, max_snapshot_age)
+    snapshot_filters = None
+    if recent is not None:
+        snapshot_filters = recent.filters
+        console.print("[cyan]Using it as current state, skipping scrape")
 
-        sync_client = ProtonMailSync(headless=headless, credentials=creds)
+    async def _run():
+        sync_client = None
         try:
-            await sync_client.initialize()
-            await sync_client.login()
-            await sync_client.navigate_to_filters()
+            if snapshot_filters is not None:
+                current_filters = snapshot_filters
+                sync_client = ProtonMailSync(headless=headless, credentials=creds)
+                await _prepare_session(sync_client)
+            else:
+                scraper = ProtonMailScraper(headless=headless, credentials=creds)
+                try:
+                    await _prepare_session(scraper)
+                    raw_filters = await scraper.scrape_all_filters(workers=_workers, browsers=browsers)
+                    current_filters = parse_scraped_filters(raw_filters)
+                    # Toggle in the browser that is already logged in and on the filters page
+                    sync_client = ProtonMailSync.from_session(scraper)
+                finally:
+                    await scraper.close()
 
             restore_engine = RestoreEngine(sync_client)
+            manager.record_remote_write()
             report = await restore_engine.restore_from_backup(bkup, current_filters)
 
             console.print(Panel(
@@ -789,9 +941,10 @@ def restore(
                     console.print(f"  [red]{err}")
 
         finally:
-            await sync_client.close()
+            if sync_client is not None:
+                await sync_client.close()
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -800,13 +953,18 @@ def cleanup(
     credentials_file: str = typer.Option("", "--credentials-file", help="Credentials file"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Preview what will be deleted"),
     workers: int = typer.Option(5, "--workers", "-w", help="Parallel browser tabs for scraping (1=sequential, max 10)"),
+    browsers: int = typer.Option(1, "--browsers", help="Browser instances to spread scraping tabs over (1=one browser)"),
 ):
     """Delete all disabled filters (with confirmation).
 
     Auto-archives disabled filters before deletion to preserve them for future consolidation.
     """
+    from datetime import datetime, timezone
     from src.scraper.protonmail_scraper import ProtonMailScraper
     from src.scraper.protonmail_sync import ProtonMailSync
+    from src.backup.backup_manager import BackupManager
+    from src.models.backup_models import ArchiveEntry
+    from src.parser.filter_parser import parse_scraped_filters
 
     creds = _get_credentials(credentials_file, False)
     _workers = max(1, min(workers, 10))
@@ -815,90 +973,84 @@ def cleanup(
     async def _run():
         scraper = ProtonMailScraper(headless=headless, credentials=creds)
         try:
-            await scraper.initialize()
-            await scraper.login()
-            await scraper.navigate_to_filters()
-            raw_filters = await scraper.scrape_all_filters(workers=_workers)
-            filters = parse_scraped_filters(raw_filters)
-        finally:
-            await scraper.close()
-
-        disabled = [f for f in filters if not f.enabled]
+            await _prepare_session(scraper)
+            raw_filters = await scraper.scrape_all_filters(workers=_workers, browsers=browsers)
+            # Enabled filters are never touched here, so don't build models for them
+            disabled = parse_scraped_filters(raw_filters, enabled=False)
 
-        if not disabled:
-            console.print("[green]No disabled filters to clean up.")
-            return
+            if not disabled:
+                console.print("[green]No disabled filters to clean up.")
+                return
 
-        # Auto-archive any disabled filters missing from the archive
-        try:
-            latest_dir = manager.snapshot_dir_for("latest")
-            archive_entries = manager.load_archive(latest_dir)
-            archive_hashes = {e.filter.content_hash for e in archive_entries}
-            now_ts = datetime.now(timezone.utc).isoformat()
-            auto_archived = 0
+            # Auto-archive any disabled filters missing from the archive
+            try:
+                latest_dir = manager.snapshot_dir_for("latest")
+                archive_entries = manager.load_archive(latest_dir)
+                archive_hashes = {e.filter.content_hash for e in archive_entries}
+                now_ts = datetime.now(timezone.utc).isoformat()
+                auto_archived = 0
+                for f in disabled:
+                    if f.content_hash not in archive_hashes:
+                        archived_f = f.model_copy(update={"status": FilterStatus.ARCHIVED, "enabled": False})
+                        archive_entries.append(ArchiveEntry(
+                            filter=archived_f,
+                            archived_at=now_ts,
+                            source_snapshot=latest_dir.name,
+                        ))
+                        auto_archived += 1
+                if auto_archived:
+                    manager.write_archive(latest_dir, archive_entries)
+                    console.print(f"[cyan]Auto-archived {auto_archived} filters missing from archive")
+            except FileNotFoundError:
+                pass  # No latest snapshot, skip archive step
+
+            console.print(f"\n[bold yellow]Found {len(disabled)} disabled filters:")
             for f in disabled:
-                if f.content_hash not in archive_hashes:
-                    archived_f = f.model_copy(deep=True)
-                    archived_f.status = FilterStatus.ARCHIVED
-                    archived_f.enabled = False
-                    archive_entries.append(ArchiveEntry(
-                        filter=archived_f,
-                        archived_at=now_ts,
-                        source_snapshot=latest_dir.name,
-                    ))
-                    auto_archived += 1
-            if auto_archived:
-                manager.write_archive(latest_dir, archive_entries)
-                console.print(f"[cyan]Auto-archived {auto_archived} filters missing from archive")
-        except FileNotFoundError:
-            pass  # No latest snapshot, skip archive step
-
-        console.print(f"\n[bold yellow]Found {len(disabled)} disabled filters:")
-        for f in disabled:
-            console.print(f"  [yellow]- {f.name}")
-
-        if dry_run:
-            console.print("\n[bold yellow]DRY RUN - No filters will be deleted.")
-            return
-
-        confirm = typer.confirm(f"\nDelete {len(disabled)} disabled filters? This cannot be undone!")
-        if not confirm:
-            console.print("[yellow]Cleanup cancelled.")
-            return
+                console.print(f"  [yellow]- {f.name}")
 
-        sync_client = ProtonMailSync(headless=headless, credentials=creds)
-        try:
-            await sync_client.initialize()
-            await sync_client.login()
-            await sync_client.navigate_to_filters()
+            if dry_run:
+                console.print("\n[bold yellow]DRY RUN - No filters will be deleted.")
+                return
 
-            deleted_count = 0
-            for f in disabled:
-                if await sync_client.delete_filter(f.name):
-                    deleted_count += 1
-                    console.print(f"  [red]Deleted: {f.name}")
+            if not typer.confirm(f"\nDelete {len(disabled)} disabled filters? This cannot be undone!"):
+                console.print("[yellow]Cleanup cancelled.")
+                return
 
-            console.print(f"\n[green]Deleted {deleted_count}/{len(disabled)} filters")
+            # Delete in the browser that is already logged in and on the filters page
+            sync_client = ProtonMailSync.from_session(scraper)
+            try:
+                manager.record_remote_write()
+                with console.status(f"[bold green]Deleting {len(disabled)} filters..."):
+                    deleted = await sync_client.delete_filters([f.name for f in disabled], workers=_workers)
+                for name in deleted:
+                    console.print(f"  [red]Deleted: {name}")
+
+                console.print(f"\n[green]Deleted {len(deleted)}/{len(disabled)} filters")
+            finally:
+                await sync_client.close()
         finally:
-            await sync_client.close()
+            await scraper.close()
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 # --- Snapshot sub-commands ---
 
-def _load_merged_filters(manager: BackupManager, backup_id: str) -> tuple[List[ProtonMailFilter], List[ArchiveEntry], Path]:
+def _load_merged_filters(manager: "BackupManager", backup_id: str) -> "tuple[List[ProtonMailFilter], List[ArchiveEntry], Path]":
     """Load backup + archive and return merged view.
 
     Returns (merged_filters, archive_entries, snapshot_dir).
     Archive entries override backup entries with the same content_hash.
+    The two files are independent, so archive.json is read on a worker
+    thread while backup.json is read here.
     """
-    snapshot_dir = manager.snapshot_dir_for(backup_id)
-    bkup = manager.load_backup(backup_id)
-    archive_entries = manager.load_archive(snapshot_dir)
+    from concurrent.futures import ThreadPoolExecutor
 
-    # Index archive entries by content_hash
-    archive_by_hash = {e.filter.content_hash: e for e in archive_entries}
+    snapshot_dir = manager.snapshot_dir_for(backup_id)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        archive_future = pool.submit(manager.load_archive, snapshot_dir)
+        bkup = manager.load_backup(backup_id)
+        archive_entries = archive_future.result()
 
     merged = []
     seen_hashes = set()
@@ -922,6 +1074,10 @@ def snapshot_view(
     backup_id: str = typer.Option("latest", "--backup", help="Backup identifier (timestamp or 'latest')"),
 ):
     """View all filters in a snapshot (backup + archive merged)."""
+    from rich.panel import Panel
+    from rich.table import Table
+    from src.backup.backup_manager import BackupManager
+
     manager = BackupManager()
     merged, archive_entries, snapshot_dir = _load_merged_filters(manager, backup_id)
 
@@ -930,21 +1086,8 @@ def snapshot_view(
         return
 
     # Count by status
-    counts = {}
-    for f in merged:
-        counts[f.status.value] = counts.get(f.status.value, 0) + 1
-
-    summary_parts = []
-    for status_val in ["enabled", "disabled", "archived", "deprecated"]:
-        count = counts.get(status_val, 0)
-        if status_val == "enabled":
-            summary_parts.append(f"Enabled: [green]{count}[/]")
-        elif status_val == "disabled":
-            summary_parts.append(f"Disabled: [yellow]{count}[/]")
-        elif status_val == "archived":
-            summary_parts.append(f"Archived: [cyan]{count}[/]")
-        elif status_val == "deprecated":
-            summary_parts.append(f"Deprecated: [dim]{count}[/]")
+    counts = Counter(f.status for f in merged)
+    summary_parts = [f"{label}: [{color}]{counts[status]}[/]" for status, label, color in _STATUS_SUMMARY]
 
     console.print(Panel(
         f"[bold]Snapshot: {snapshot_dir.name}[/]\n"
@@ -953,13 +1096,6 @@ def snapshot_view(
         title="Snapshot View",
     ))
 
-    STATUS_STYLE = {
-        FilterStatus.ENABLED: "[green]enabled[/]",
-        FilterStatus.DISABLED: "[yellow]disabled[/]",
-        FilterStatus.ARCHIVED: "[cyan]archived[/]",
-        FilterStatus.DEPRECATED: "[dim]deprecated[/]",
-    }
-
     table = Table(title="Filters")
     table.add_column("#", justify="right", style="dim")
     table.add_column("Name", max_width=40)
@@ -968,32 +1104,8 @@ def snapshot_view(
     table.add_column("Actions", max_width=30)
 
     for i, f in enumerate(merged, 1):
-        status_str = STATUS_STYLE.get(f.status, str(f.status.value))
-
-        # Color the name based on status
-        name_style = {
-            FilterStatus.ENABLED: "green",
-            FilterStatus.DISABLED: "yellow",
-            FilterStatus.ARCHIVED: "cyan",
-            FilterStatus.DEPRECATED: "dim",
-        }.get(f.status, "")
-        name_str = f"[{name_style}]{f.name}[/]" if name_style else f.name
-
-        cond_parts = []
-        for c in f.conditions:
-            cond_parts.append(f"{c.type.value} {c.operator.value} \"{c.value}\"")
-        conds_str = f" {f.logic.value.upper()} ".join(cond_parts) if cond_parts else "[dim]none[/]"
-
-        action_parts = []
-        for a in f.actions:
-            if a.parameters:
-                params = ", ".join(f"{v}" for v in a.parameters.values())
-                action_parts.append(f"{a.type.value}({params})")
-            else:
-                action_parts.append(a.type.value)
-        actions_str = ", ".join(action_parts) if action_parts else "[dim]none[/]"
-
-        table.add_row(str(i), name_str, status_str, conds_str, actions_str)
+        name = Text(f.name, style=_STATUS_NAME_STYLE[f.status])
+        table.add_row(Text(str(i)), name, _STATUS_CELLS[f.status], _format_conditions(f), _format_actions(f))
 
     console.print(table)
 
@@ -1008,47 +1120,78 @@ def snapshot_set_status(
 
     The backup.json file is immutable. Status overrides are stored in archive.json.
     """
+    from src.backup.backup_manager import BackupManager
+
     manager = BackupManager()
-    snapshot_dir = manager.snapshot_dir_for(backup_id)
-    bkup = manager.load_backup(backup_id)
-    archive_entries = manager.load_archive(snapshot_dir)
+    result = manager.set_filter_statuses(backup_id, {name: status})[name]
 
-    # Find the filter in archive or backup
-    archive_idx = None
-    for i, entry in enumerate(archive_entries):
-        if entry.filter.name == name:
-            archive_idx = i
-            break
+    if result == "not_found":
+        console.print(f"[red]Filter not found: '{name}'")
+        raise typer.Exit(1)
+    if result == "unchanged":
+        console.print(f"[dim]Archive entry '{name}' is already {status.value}, no change")
+        return
+    verb = "Updated" if result == "updated" else "Created"
+    console.print(f"[green]{verb} archive entry '{name}' -> {status.value}")
 
-    backup_filter = None
-    for f in bkup.filters:
-        if f.name == name:
-            backup_filter = f
-            break
 
-    if archive_idx is None and backup_filter is None:
-        console.print(f"[red]Filter not found: '{name}'")
+@snapshot_app.command("set-status-batch")
+def snapshot_set_status_batch(
+    assignments: Optional[List[str]] = typer.Option(None, "--set", help="NAME=STATUS update (repeatable)"),
+    updates_file: str = typer.Option("", "--file", help="JSON file mapping filter names to statuses"),
+    backup_id: str = typer.Option("latest", "--backup", help="Backup identifier"),
+):
+    """Set the status of many filters at once, writing archive.json a single time.
+
+    Updates from --file are applied first; --set entries override them.
+    """
+    import json
+    from src.backup.backup_manager import BackupManager
+
+    raw: dict = {}
+    if updates_file:
+        try:
+            loaded = json.loads(Path(updates_file).read_text())
+            if not isinstance(loaded, dict):
+                raise TypeError(f"expected a JSON object, got {type(loaded).__name__}")
+            raw.update(loaded)
+        except (OSError, ValueError, TypeError) as e:
+            console.print(f"[red]Could not read --file {updates_file}: {e}[/red]")
+            raise typer.Exit(1)
+    for assignment in assignments or []:
+        # Split on the last '=' so filter names may contain one
+        name, sep, value = assignment.rpartition("=")
+        if not sep or not name:
+            console.print(f"[red]Expected NAME=STATUS, got: '{assignment}'")
+            raise typer.Exit(1)
+        raw[name] = value
+
+    if not raw:
+        console.print("[red]No updates given. Use --set NAME=STATUS or --file.")
         raise typer.Exit(1)
 
-    if archive_idx is not None:
-        # Update existing archive entry
-        archive_entries[archive_idx].filter.status = status
-        archive_entries[archive_idx].filter.enabled = status == FilterStatus.ENABLED
-        console.print(f"[green]Updated archive entry '{name}' -> {status.value}")
-    else:
-        # Create new archive entry from backup filter (backup stays immutable)
-        archived_filter = backup_filter.model_copy(deep=True)
-        archived_filter.status = status
-        archived_filter.enabled = status == FilterStatus.ENABLED
-        entry = ArchiveEntry(
-            filter=archived_filter,
-            archived_at=datetime.now(timezone.utc).isoformat(),
-            source_snapshot=snapshot_dir.name,
-        )
-        archive_entries.append(entry)
-        console.print(f"[green]Created archive entry '{name}' -> {status.value}")
+    valid = ", ".join(s.value for s in FilterStatus)
+    updates = {}
+    for name, value in raw.items():
+        try:
+            updates[name] = FilterStatus(value)
+        except ValueError:
+            console.print(f"[red]Invalid status '{value}' for '{name}' (expected one of: {valid})")
+            raise typer.Exit(1)
 
-    manager.write_archive(snapshot_dir, archive_entries)
+    manager = BackupManager()
+    results = manager.set_filter_statuses(backup_id, updates)
+
+    counts = Counter(results.values())
+    console.print(
+        f"[green]Updated {counts['updated']}, created {counts['created']} archive entries"
+        f" ({counts['unchanged']} already up to date)"
+    )
+    missing = [name for name, result in results.items() if result == "not_found"]
+    if missing:
+        for name in missing:
+            console.print(f"[red]Filter not found: '{name}'")
+        raise typer.Exit(1)
 
 
 @snapshot_app.command("remove")
@@ -1060,26 +1203,22 @@ def snapshot_remove(
 
     To exclude a scraped filter from consolidation, use 'set-status <name> deprecated' instead.
     """
+    from src.backup.backup_manager import BackupManager
+
     manager = BackupManager()
     snapshot_dir = manager.snapshot_dir_for(backup_id)
     archive_entries = manager.load_archive(snapshot_dir)
 
     # Check if filter exists in archive
-    found = False
-    new_entries = []
-    for entry in archive_entries:
-        if entry.filter.name == name:
-            found = True
-        else:
-            new_entries.append(entry)
+    new_entries = [e for e in archive_entries if e.filter.name != name]
 
-    if not found:
+    if len(new_entries) == len(archive_entries):
         # Check if it's in backup only
         bkup = manager.load_backup(backup_id)
         in_backup = any(f.name == name for f in bkup.filters)
         if in_backup:
             console.print(f"[red]Filter '{name}' exists only in backup.json (immutable).")
-            console.print("[yellow]Use 'snapshot set-status \"{name}\" deprecated' to exclude it from consolidation.")
+            console.print(f"[yellow]Use 'snapshot set-status \"{name}\" deprecated' to exclude it from consolidation.")
         else:
             console.print(f"[red]Filter not found: '{name}'")
         raise typer.Exit(1)
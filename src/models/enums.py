@@ -0,0 +1,41 @@
+"""Filter enums, kept free of pydantic so the CLI can import them cheaply."""
+
+from enum import Enum
+
+
+class ConditionType(str, Enum):
+    SENDER = "sender"
+    RECIPIENT = "recipient"
+    SUBJECT = "subject"
+    ATTACHMENTS = "attachments"
+    HEADER = "header"
+
+
+class Operator(str, Enum):
+    CONTAINS = "contains"
+    IS = "is"
+    MATCHES = "matches"
+    STARTS_WITH = "starts_with"
+    ENDS_WITH = "ends_with"
+    HAS = "has"  # for attachments
+
+
+class ActionType(str, Enum):
+    MOVE_TO = "move_to"
+    LABEL = "label"
+    MARK_READ = "mark_read"
+    STAR = "star"
+    ARCHIVE = "archive"
+    DELETE = "delete"
+
+
+class LogicType(str, Enum):
+    AND = "and"
+    OR = "or"
+
+
+class FilterStatus(str, Enum):
+    ENABLED = "enabled"
+    DISABLED = "disabled"
+    ARCHIVED = "archived"
+    DEPRECATED = "deprecated"
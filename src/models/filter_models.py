@@ -1,56 +1,92 @@
 import hashlib
-from enum import Enum
+import json
+from functools import cached_property
 from typing import List, Optional
 from pydantic import BaseModel, Field, model_validator
 
-
-class ConditionType(str, Enum):
-    SENDER = "sender"
-    RECIPIENT = "recipient"
-    SUBJECT = "subject"
-    ATTACHMENTS = "attachments"
-    HEADER = "header"
-
-
-class Operator(str, Enum):
-    CONTAINS = "contains"
-    IS = "is"
-    MATCHES = "matches"
-    STARTS_WITH = "starts_with"
-    ENDS_WITH = "ends_with"
-    HAS = "has"  # for attachments
-
-
-class ActionType(str, Enum):
-    MOVE_TO = "move_to"
-    LABEL = "label"
-    MARK_READ = "mark_read"
-    STAR = "star"
-    ARCHIVE = "archive"
-    DELETE = "delete"
+from src.models.enums import ConditionType, Operator, ActionType, LogicType, FilterStatus
 
 
 class FilterCondition(BaseModel):
     type: ConditionType
     operator: Operator
     value: str = ""
+    # Individual values of a merged condition (set by merge_conditions). When
+    # present, these are authoritative and value is only a '|'-joined display
+    # string. Never serialized, so backups and fingerprints are unaffected.
+    values: Optional[List[str]] = Field(default=None, exclude=True)
+
+
+# Cached properties on FilterAction, dropped whenever a field is assigned
+_ACTION_CACHED_PROPERTIES = ("key", "group_label", "analysis_label")
 
 
 class FilterAction(BaseModel):
     type: ActionType
     parameters: dict = Field(default_factory=dict)
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        for cached in _ACTION_CACHED_PROPERTIES:
+            self.__dict__.pop(cached, None)
+
+    def model_copy(self, *, update=None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        for cached in _ACTION_CACHED_PROPERTIES:
+            copied.__dict__.pop(cached, None)
+        return copied
+
+    @cached_property
+    def key(self) -> tuple:
+        """Hashable key of the action: its type plus sorted parameters.
 
-class LogicType(str, Enum):
-    AND = "and"
-    OR = "or"
+        Cached until the next field assignment; in-place edits to parameters
+        are not tracked, so reassign the field instead.
+        """
+        return (self.type.value, tuple(sorted((k, str(v)) for k, v in self.parameters.items())))
+
+    @cached_property
+    def group_label(self) -> str:
+        """Consolidation report label: the action type, plus '(folder)' if it has one."""
+        folder = self.parameters.get("folder")
+        return f"{self.type.value} ({folder})" if folder else self.type.value
+
+    @cached_property
+    def analysis_label(self) -> str:
+        """Analysis label: the action type, plus '-> folder' if it has one."""
+        folder = self.parameters.get("folder")
+        return f"{self.type.value} -> {folder}" if folder else self.type.value
+
+
+# Priority ordering: lower number = higher priority (evaluated first)
+ACTION_PRIORITY = {
+    ActionType.DELETE: 0,      # Spam/delete first (most common, stops processing)
+    ActionType.ARCHIVE: 1,     # Archive next
+    ActionType.MOVE_TO: 2,     # Folder routing
+    ActionType.LABEL: 3,       # Labeling
+    ActionType.MARK_READ: 4,   # Mark as read
+    ActionType.STAR: 5,        # Star
+}
 
 
-class FilterStatus(str, Enum):
-    ENABLED = "enabled"
-    DISABLED = "disabled"
-    ARCHIVED = "archived"
-    DEPRECATED = "deprecated"
+# Cached properties on ProtonMailFilter, dropped whenever a field is assigned
+_CACHED_PROPERTIES = (
+    "canonical_dump", "fingerprint", "fingerprint_ignoring_enabled", "actions_key", "content_hash",
+)
+
+
+def _fingerprint(dump: dict, exclude: tuple) -> int:
+    """64-bit BLAKE2b fingerprint of a dump with the excluded keys removed.
+
+    model_dump emits model fields in declared order, so only the free-form
+    action parameter dicts need sorting to make the encoding canonical.
+    """
+    canonical = {k: v for k, v in dump.items() if k not in exclude}
+    canonical["actions"] = [
+        {**a, "parameters": dict(sorted(a["parameters"].items()))} for a in dump["actions"]
+    ]
+    raw = json.dumps(canonical, separators=(",", ":"))
+    return int.from_bytes(hashlib.blake2b(raw.encode(), digest_size=8).digest(), "big")
 
 
 class ProtonMailFilter(BaseModel):
@@ -78,7 +114,51 @@ class ProtonMailFilter(BaseModel):
                 data['enabled'] = status == FilterStatus.ENABLED
         return data
 
-    @property
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        # Any field assignment invalidates the cached dump and fingerprints
+        for cached in _CACHED_PROPERTIES:
+            self.__dict__.pop(cached, None)
+
+    def model_copy(self, *, update=None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        for cached in _CACHED_PROPERTIES:
+            copied.__dict__.pop(cached, None)
+        return copied
+
+    @cached_property
+    def canonical_dump(self) -> dict:
+        """JSON-mode dump of the filter, cached until the next field assignment.
+
+        Shared between callers: treat it as read-only. In-place edits to
+        nested lists/dicts are not tracked, so reassign the field instead.
+        """
+        return self.model_dump(mode="json")
+
+    @cached_property
+    def fingerprint(self) -> int:
+        """64-bit fingerprint of every field except status.
+
+        Two filters with equal fingerprints are treated as identical by
+        DiffEngine (status is compared separately, as state).
+        """
+        return _fingerprint(self.canonical_dump, ("status",))
+
+    @cached_property
+    def fingerprint_ignoring_enabled(self) -> int:
+        """64-bit fingerprint of every field except enabled and status."""
+        return _fingerprint(self.canonical_dump, ("enabled", "status"))
+
+    @cached_property
+    def actions_key(self) -> frozenset:
+        """Hashable, order-insensitive key of the filter's actions.
+
+        Filters with equal keys perform the same actions and can be grouped.
+        A repeated action counts once, as it does when the rule runs.
+        """
+        return frozenset(a.key for a in self.actions)
+
+    @cached_property
     def content_hash(self) -> str:
         """Content-addressable hash of filter identity (name + logic + conditions + actions).
 
@@ -119,3 +199,20 @@ class ConsolidatedFilter(BaseModel):
     actions: List[FilterAction] = Field(default_factory=list)
     source_filters: List[str] = Field(default_factory=list)  # original filter names
     filter_count: int = 0  # how many filters were merged
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        self.__dict__.pop("min_priority", None)
+
+    def model_copy(self, *, update=None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        copied.__dict__.pop("min_priority", None)
+        return copied
+
+    @cached_property
+    def min_priority(self) -> int:
+        """Priority of the filter's most important action (lower = evaluated first).
+
+        Actions missing from ACTION_PRIORITY rank 10; a filter with no actions ranks 99.
+        """
+        return min((ACTION_PRIORITY.get(a.type, 10) for a in self.actions), default=99)
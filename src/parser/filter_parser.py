@@ -1,7 +1,7 @@
 """Parse scraped filter data into validated Pydantic models."""
 
 import logging
-from typing import List
+from typing import List, Optional
 
 from src.models.filter_models import (
     ProtonMailFilter, FilterCondition, FilterAction,
@@ -117,8 +117,18 @@ def parse_filter(raw: dict) -> ProtonMailFilter:
     )
 
 
-def parse_scraped_filters(raw_filters: List[dict]) -> List[ProtonMailFilter]:
-    """Parse a list of scraped filter dicts into validated models."""
+def parse_scraped_filters(raw_filters: List[dict], enabled: Optional[bool] = None) -> List[ProtonMailFilter]:
+    """Parse a list of scraped filter dicts into validated models.
+
+    If enabled is given, only filters whose scraped toggle state matches are
+    parsed; the rest are dropped before any model is built.
+    """
+    if enabled is not None:
+        # Malformed (non-dict) items are kept so the loop below logs and skips them
+        raw_filters = [
+            raw for raw in raw_filters
+            if not isinstance(raw, dict) or raw.get("enabled", True) == enabled
+        ]
     parsed = []
     for raw in raw_filters:
         try:
@@ -1,7 +1,7 @@
 """Shared browser automation base class for ProtonMail."""
 
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext
 
@@ -47,8 +47,24 @@ class ProtonMailBrowser:
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self._playwright = None
+        self._extra_browsers: List[Browser] = []
         self.account_email: str = ""
 
+    @classmethod
+    def from_session(cls, other: "ProtonMailBrowser") -> "ProtonMailBrowser":
+        """Create a client that takes over another client's logged-in browser.
+
+        The browser, context and current page move to the new client, so it
+        can act without launching or logging in again. Closing other
+        afterwards leaves them open; close the new client instead.
+        """
+        client = cls(headless=other.headless, credentials=other.credentials)
+        client._playwright, client.browser = other._playwright, other.browser
+        client.context, client.page = other.context, other.page
+        client.account_email = other.account_email
+        other._playwright = other.browser = other.context = other.page = None
+        return client
+
     async def initialize(self):
         """Launch Playwright browser."""
         self._playwright = await async_playwright().start()
@@ -267,12 +283,40 @@ class ProtonMailBrowser:
 
         return False
 
-    async def create_worker_page(self) -> Page:
-        """Create an additional page in the existing browser context."""
-        return await self.context.new_page()
+    async def create_worker_page(self, context: Optional[BrowserContext] = None) -> Page:
+        """Create an additional page in the given (default: existing) browser context."""
+        return await (context or self.context).new_page()
+
+    async def create_worker_contexts(self, count: int) -> List[BrowserContext]:
+        """Launch count extra browsers whose contexts reuse this session's login.
+
+        Tabs in one Chromium instance share its main thread; spreading workers
+        over separate browsers avoids that. The session is carried over via
+        Playwright's storage state (cookies and local storage). Release them
+        with close_worker_browsers() (close() also does).
+        """
+        state = await self.context.storage_state()
+        contexts = []
+        for _ in range(count):
+            browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._extra_browsers.append(browser)
+            contexts.append(await browser.new_context(
+                viewport=VIEWPORT,
+                user_agent=USER_AGENT,
+                storage_state=state,
+            ))
+        logger.info("Launched %d extra browsers for workers", count)
+        return contexts
+
+    async def close_worker_browsers(self):
+        """Close browsers launched by create_worker_contexts()."""
+        browsers, self._extra_browsers = self._extra_browsers, []
+        for browser in browsers:
+            await browser.close()
 
     async def close(self):
         """Close the browser."""
+        await self.close_worker_browsers()
         if self.browser:
             await self.browser.close()
         if self._playwright:
@@ -4,7 +4,7 @@ import asyncio
 import logging
 from typing import Dict, List, Optional
 
-from playwright.async_api import Page
+from playwright.async_api import BrowserContext, Page
 
 from src.scraper import selectors
 from src.scraper.browser import (
@@ -62,11 +62,14 @@ class ProtonMailScraper(ProtonMailBrowser):
         super().__init__(*args, **kwargs)
         self._folder_path_map: Optional[dict] = None
 
-    async def scrape_all_filters(self, workers: int = 1) -> List[dict]:
+    async def scrape_all_filters(self, workers: int = 1, browsers: int = 1) -> List[dict]:
         """Scrape all filters from the Custom filters section only.
 
         Args:
             workers: Number of parallel browser tabs to use (1=sequential).
+            browsers: Number of browser instances to spread the worker tabs
+                over (1=all tabs in this browser). Extra browsers reuse the
+                current login session.
 
         Returns list of dicts with filter data. Each dict has:
         - name: str
@@ -103,10 +106,20 @@ class ProtonMailScraper(ProtonMailBrowser):
         chunks = _distribute_indices(total, workers)
         logger.info("Scraping with %d parallel workers", workers)
 
-        worker_results = await asyncio.gather(
-            *[self._scrape_worker(wid, chunk) for wid, chunk in enumerate(chunks)],
-            return_exceptions=True,
-        )
+        # Worker tabs are dealt round-robin over this browser and any extras
+        contexts = [self.context]
+        try:
+            if browsers > 1:
+                contexts += await self.create_worker_contexts(min(browsers, workers) - 1)
+            worker_results = await asyncio.gather(
+                *[
+                    self._scrape_worker(wid, chunk, contexts[wid % len(contexts)])
+                    for wid, chunk in enumerate(chunks)
+                ],
+                return_exceptions=True,
+            )
+        finally:
+            await self.close_worker_browsers()
 
         # Merge results in priority order
         merged: Dict[int, dict] = {}
@@ -133,9 +146,11 @@ class ProtonMailScraper(ProtonMailBrowser):
                 logger.warning("Failed to scrape filter %d: %s", idx, e)
         return filters
 
-    async def _scrape_worker(self, worker_id: int, indices: List[int]) -> Dict[int, dict]:
+    async def _scrape_worker(
+        self, worker_id: int, indices: List[int], context: Optional[BrowserContext] = None,
+    ) -> Dict[int, dict]:
         """Scrape assigned filter indices using a dedicated browser tab."""
-        page = await self.create_worker_page()
+        page = await self.create_worker_page(context)
         try:
             url = getattr(self, '_filters_page_url', FILTERS_DIRECT_URL)
             await page.goto(
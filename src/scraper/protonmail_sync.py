@@ -1,14 +1,18 @@
 """Playwright automation for sync/restore operations on ProtonMail."""
 
+import asyncio
 import logging
 from typing import Dict, List, Optional
 
+from playwright.async_api import Page
+
 from src.scraper import selectors
 from src.scraper.browser import (
     ProtonMailBrowser, MODAL_TRANSITION_MS, DROPDOWN_MS,
-    ALL_SETTINGS_LOAD_MS,
+    ALL_SETTINGS_LOAD_MS, FILTERS_PAGE_LOAD_MS,
 )
-from src.utils.config import ELEMENT_TIMEOUT_MS
+from src.scraper.protonmail_scraper import _distribute_indices
+from src.utils.config import ELEMENT_TIMEOUT_MS, FILTERS_DIRECT_URL, PAGE_LOAD_TIMEOUT_MS
 
 # Maps our model condition types to ProtonMail UI dropdown labels
 CONDITION_TYPE_LABELS = {
@@ -366,9 +370,10 @@ class ProtonMailSync(ProtonMailBrowser):
         logger.info("Disabled %d filters", disabled)
         return disabled
 
-    async def delete_filter(self, name: str) -> bool:
+    async def delete_filter(self, name: str, page: Page = None) -> bool:
         """Delete a single filter by name."""
-        page = self.page
+        if page is None:
+            page = self.page
         rows = await page.query_selector_all(selectors.FILTER_TABLE_ROWS)
 
         for row in rows:
@@ -388,13 +393,62 @@ class ProtonMailSync(ProtonMailBrowser):
                     await delete_item.click()
                     await page.wait_for_timeout(DROPDOWN_MS)
 
-                    await self._confirm_delete()
+                    await self._confirm_delete(page)
                     logger.info("Deleted filter: %s", name)
                     return True
 
         logger.warning("Filter '%s' not found for deletion", name)
         return False
 
+    async def delete_filters(self, names: List[str], workers: int = 1) -> List[str]:
+        """Delete filters by name. Returns the names deleted, in input order.
+
+        Args:
+            names: Filter names to delete.
+            workers: Number of parallel browser tabs to use (1=sequential).
+                Each worker tab loads the filters page and deletes its own
+                share of the names.
+        """
+        # Same-named filters are told apart only by row order on one page,
+        # so those are always deleted sequentially
+        if workers <= 1 or len(names) <= 1 or len(set(names)) != len(names):
+            return [name for name in names if await self.delete_filter(name)]
+
+        url = self.page.url or FILTERS_DIRECT_URL
+        chunks = _distribute_indices(len(names), workers)
+        logger.info("Deleting %d filters with %d parallel workers", len(names), len(chunks))
+
+        worker_results = await asyncio.gather(
+            *[self._delete_worker(wid, url, [names[i] for i in chunk]) for wid, chunk in enumerate(chunks)],
+            return_exceptions=True,
+        )
+
+        deleted = set()
+        for result in worker_results:
+            if isinstance(result, Exception):
+                logger.warning("Delete worker failed: %s", result)
+            else:
+                deleted.update(result)
+        return [name for name in names if name in deleted]
+
+    async def _delete_worker(self, worker_id: int, url: str, names: List[str]) -> List[str]:
+        """Delete the given filters using a dedicated browser tab."""
+        page = await self.create_worker_page()
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=PAGE_LOAD_TIMEOUT_MS)
+            await page.wait_for_timeout(FILTERS_PAGE_LOAD_MS)
+
+            deleted = []
+            for name in names:
+                try:
+                    if await self.delete_filter(name, page=page):
+                        deleted.append(name)
+                except Exception as e:
+                    logger.warning("Worker %d: failed to delete filter '%s': %s", worker_id, name, e)
+            return deleted
+        finally:
+            await page.close()
+
     async def delete_all_filters(self) -> int:
         """Delete all filters on the page. Returns count deleted."""
         page = self.page
@@ -427,9 +481,10 @@ class ProtonMailSync(ProtonMailBrowser):
         logger.info("Deleted %d filters total", deleted)
         return deleted
 
-    async def _confirm_delete(self) -> bool:
+    async def _confirm_delete(self, page: Page = None) -> bool:
         """Confirm a delete dialog."""
-        page = self.page
+        if page is None:
+            page = self.page
         await page.wait_for_timeout(DROPDOWN_MS)
         confirm_btn = await page.query_selector(selectors.DELETE_CONFIRM_BUTTON)
         if not confirm_btn:
@@ -307,3 +307,137 @@ def temp_snapshot_with_archive(temp_snapshots_dir, sample_filters_list, sample_a
     snapshot_dir = manager.snapshot_dir_for("latest")
     manager.write_archive(snapshot_dir, sample_archive_entries)
     return snapshot_dir, manager, sample_archive_entries
+
+
+# --- CLI fixtures ---
+
+@pytest.fixture
+def cli_snapshots_dir(tmp_path, monkeypatch):
+    """Set up a temp snapshots dir that the CLI will use via BackupManager()."""
+    import src.backup.backup_manager
+    import src.utils.config
+
+    snapshots_dir = tmp_path / "snapshots"
+    snapshots_dir.mkdir()
+    monkeypatch.setattr(src.utils.config, "SNAPSHOTS_DIR", snapshots_dir)
+    monkeypatch.setattr(src.backup.backup_manager, "SNAPSHOTS_DIR", snapshots_dir)
+    return snapshots_dir
+
+
+@pytest.fixture
+def wide_console(monkeypatch):
+    """Ensure Rich console is wide enough for full table output in CliRunner."""
+    import src.main
+    from rich.console import Console
+
+    monkeypatch.setattr(src.main, "console", Console(width=200))
+
+
+class _FakeScraper:
+    """Stand-in for ProtonMailScraper serving canned filters and Sieve script."""
+
+    raw_filters: list = []
+    sieve_script = ""
+    account_email = ""
+    instances: list = []
+
+    def __init__(self, **kwargs):
+        self.closed = False
+        self.instances.append(self)
+
+    async def initialize(self):
+        pass
+
+    async def login(self):
+        pass
+
+    async def navigate_to_filters(self):
+        pass
+
+    async def scrape_all_filters(self, workers=1, browsers=1):
+        return list(self.raw_filters)
+
+    async def read_sieve_script(self, filter_name=""):
+        return self.sieve_script
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeSync:
+    """Stand-in for ProtonMailSync that records what it was asked to do."""
+
+    live_sieve = ""
+    instances: list = []
+
+    def __init__(self, **kwargs):
+        self.logged_in = False
+        self.adopted = False
+        self.closed = False
+        self.deleted = []
+        self.toggled = []
+        self.sieve_reads = 0
+        self.uploaded = None
+        self.instances.append(self)
+
+    @classmethod
+    def from_session(cls, other):
+        client = cls()
+        client.adopted = True
+        return client
+
+    async def initialize(self):
+        pass
+
+    async def login(self):
+        self.logged_in = True
+
+    async def navigate_to_filters(self):
+        pass
+
+    async def enable_filter(self, name):
+        self.toggled.append((name, True))
+        return True
+
+    async def disable_filter(self, name):
+        self.toggled.append((name, False))
+        return True
+
+    async def delete_filters(self, names, workers=1):
+        self.deleted.extend(names)
+        return list(names)
+
+    async def read_sieve_script(self, filter_name=""):
+        self.sieve_reads += 1
+        return self.live_sieve
+
+    async def disable_all_ui_filters(self):
+        return 0
+
+    async def upload_sieve(self, script, filter_name=""):
+        self.uploaded = script
+        return True
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_session(cli_snapshots_dir, monkeypatch, tmp_path):
+    """Replace both browser clients with in-memory fakes.
+
+    Returns a namespace with the fake scraper and sync classes and the path
+    of a credentials file. The classes are fresh subclasses, so canned data
+    and recorded instances set in one test never leak into another.
+    """
+    from types import SimpleNamespace
+    import src.scraper.protonmail_scraper
+    import src.scraper.protonmail_sync
+
+    scraper = type("FakeScraper", (_FakeScraper,), {"raw_filters": [], "instances": []})
+    sync = type("FakeSync", (_FakeSync,), {"instances": []})
+    monkeypatch.setattr(src.scraper.protonmail_scraper, "ProtonMailScraper", scraper)
+    monkeypatch.setattr(src.scraper.protonmail_sync, "ProtonMailSync", sync)
+    creds = tmp_path / "creds.txt"
+    creds.write_text("Username: user@proton.me\nPassword: secret\n")
+    return SimpleNamespace(scraper=scraper, sync=sync, creds=str(creds))
@@ -7,7 +7,7 @@ import time
 from datetime import datetime
 from pathlib import Path
 
-from src.backup.backup_manager import BackupManager
+from src.backup.backup_manager import BackupManager, SNAPSHOT_NAME_FORMAT, parse_snapshot_name
 from src.models.backup_models import Backup, BackupMetadata, ArchiveEntry, Archive
 from src.models.filter_models import (
     ProtonMailFilter, FilterCondition, FilterAction, FilterStatus,
@@ -65,8 +65,8 @@ class TestBackupManager:
 
         backup = manager.create_backup(sample_filters_list)
 
-        assert backup.checksum.startswith("sha256:")
-        assert len(backup.checksum) > 7  # More than just the prefix
+        assert backup.checksum.startswith("blake2b:")
+        assert len(backup.checksum) == len("blake2b:") + 64  # 32-byte digest
 
     def test_create_backup_saves_file(self, temp_snapshots_dir, sample_filters_list):
         """Test that backup is saved to a snapshot subdirectory."""
@@ -102,6 +102,11 @@ class TestBackupManager:
         latest_link = temp_snapshots_dir / "latest"
         assert latest_link.exists()
         assert latest_link.is_symlink()
+        assert latest_link.resolve() == max(
+            d for d in temp_snapshots_dir.iterdir() if d.name != "latest"
+        ).resolve()
+        # No temp link is left behind by the atomic swap
+        assert [p.name for p in temp_snapshots_dir.iterdir() if p.name.startswith(".")] == []
 
     def test_load_backup_latest(self, temp_snapshots_dir, sample_filters_list):
         """Test loading the latest backup."""
@@ -127,6 +132,15 @@ class TestBackupManager:
 
         assert len(loaded.filters) == 3
 
+    def test_load_backup_empty_file(self, temp_snapshots_dir, sample_filters_list):
+        """Test that an empty backup.json raises a decode error rather than crashing mmap."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        (manager.snapshot_dir_for("latest") / "backup.json").write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            manager.load_backup("latest")
+
     def test_load_backup_not_found(self, temp_snapshots_dir):
         """Test loading non-existent backup raises error."""
         manager = BackupManager(temp_snapshots_dir)
@@ -173,6 +187,79 @@ class TestBackupManager:
 
         assert len(backups) == 2
 
+    def test_list_backups_sorted_and_skips_unreadable(self, temp_snapshots_dir):
+        """Test that concurrent listing keeps snapshot order and skips corrupt files."""
+        manager = BackupManager(temp_snapshots_dir)
+        for name in ["2025-01-03_00-00-00", "2025-01-01_00-00-00", "2025-01-02_00-00-00"]:
+            (temp_snapshots_dir / name).mkdir()
+            (temp_snapshots_dir / name / "backup.json").write_text(
+                json.dumps({"timestamp": name, "metadata": {"filter_count": 1}})
+            )
+        (temp_snapshots_dir / "2025-01-02_00-00-00" / "backup.json").write_text("{not json")
+
+        backups = manager.list_backups()
+
+        assert [b["snapshot"] for b in backups] == ["2025-01-01_00-00-00", "2025-01-03_00-00-00"]
+
+    def test_parse_snapshot_name_round_trip(self):
+        """Test that parse_snapshot_name inverts SNAPSHOT_NAME_FORMAT."""
+        when = datetime(2025, 3, 9, 7, 5, 1)
+        assert parse_snapshot_name(when.strftime(SNAPSHOT_NAME_FORMAT)) == when
+
+    def test_parse_snapshot_name_rejects_other_names(self):
+        """Test that non-snapshot names raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_snapshot_name("latest")
+        with pytest.raises(ValueError):
+            parse_snapshot_name("2025-13-01_00-00-00")
+
+    def test_snapshot_names_sort_chronologically(self):
+        """Test that string order of snapshot names matches chronological order."""
+        times = [datetime(2024, 12, 31, 23, 59, 59), datetime(2025, 1, 1, 0, 0, 0),
+                 datetime(2025, 1, 1, 9, 0, 0), datetime(2025, 10, 2, 0, 0, 0)]
+        names = [t.strftime(SNAPSHOT_NAME_FORMAT) for t in reversed(times)]
+        assert [parse_snapshot_name(n) for n in sorted(names)] == times
+
+    def test_list_backups_ignores_non_snapshot_entries(self, temp_snapshots_dir, sample_filters_list):
+        """Test that stray files and directories without backup.json are not listed."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        (temp_snapshots_dir / "empty-dir").mkdir()
+        (temp_snapshots_dir / "notes.txt").write_text("not a snapshot")
+
+        backups = manager.list_backups()
+
+        assert len(backups) == 1
+        assert backups[0]["path"] == str(manager.snapshot_dir_for("latest"))
+
+    def test_create_backup_writes_metadata_sidecar(self, temp_snapshots_dir, sample_filters_list):
+        """Test that create_backup writes a metadata.json without the filters."""
+        manager = BackupManager(temp_snapshots_dir)
+        backup = manager.create_backup(sample_filters_list, "test@proton.me")
+
+        data = json.loads((manager.snapshot_dir_for("latest") / "metadata.json").read_text())
+
+        assert set(data) == {"timestamp", "metadata", "checksum"}
+        assert data["metadata"]["filter_count"] == 3
+        assert data["checksum"] == backup.checksum
+
+    def test_list_backups_prefers_metadata_sidecar(self, temp_snapshots_dir, sample_filters_list):
+        """Test that list_backups reads metadata.json and falls back to backup.json."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+        sidecar = snapshot_dir / "metadata.json"
+        data = json.loads(sidecar.read_text())
+        data["metadata"]["filter_count"] = 99
+        sidecar.write_text(json.dumps(data))
+
+        assert manager.list_backups()[0]["filter_count"] == 99
+
+        sidecar.unlink()
+        listed = manager.list_backups()[0]
+        assert listed["filter_count"] == 3
+        assert listed["size_bytes"] == (snapshot_dir / "backup.json").stat().st_size
+
     def test_list_backups_excludes_latest_symlink(self, temp_snapshots_dir, sample_filters_list):
         """Test that list_backups excludes latest symlink."""
         manager = BackupManager(temp_snapshots_dir)
@@ -230,6 +317,70 @@ class TestBackupManager:
 
         assert is_valid is False
 
+    def test_verify_backup_legacy_sha256(self, temp_snapshots_dir, sample_filters_list):
+        """Test that backups with the older sha256 checksum format still verify."""
+        manager = BackupManager(temp_snapshots_dir)
+        backup = Backup(filters=sample_filters_list, sieve_script="keep;")
+        checksum_json = json.dumps(
+            {"filters": [f.model_dump() for f in sample_filters_list], "sieve_script": "keep;"},
+            sort_keys=True, default=str,
+        )
+        backup.checksum = "sha256:" + hashlib.sha256(checksum_json.encode()).hexdigest()
+
+        assert manager.verify_backup(backup) is True
+
+    def test_verify_backup_unknown_algorithm(self, temp_snapshots_dir, sample_filters_list):
+        """Test that an unrecognized checksum prefix fails verification."""
+        manager = BackupManager(temp_snapshots_dir)
+        backup = manager.create_backup(sample_filters_list)
+        backup.checksum = "md5:" + backup.checksum.partition(":")[2]
+
+        assert manager.verify_backup(backup) is False
+
+    def test_checksum_independent_of_orjson(self, temp_snapshots_dir, sample_filters_list, monkeypatch):
+        """Test that the checksum is identical with and without orjson installed."""
+        import src.backup.backup_manager as backup_manager
+        manager = BackupManager(temp_snapshots_dir)
+        backup = manager.create_backup(sample_filters_list, sieve_script="# caf\u00e9\nkeep;")
+
+        monkeypatch.setattr(backup_manager, "orjson", None)
+
+        assert manager.verify_backup(backup) is True
+
+    def test_verify_snapshot_valid(self, temp_snapshots_dir, sample_filters_list):
+        """Test verifying a snapshot's backup.json straight from disk."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list, sieve_script="keep;")
+
+        assert manager.verify_snapshot("latest") is True
+
+    def test_verify_snapshot_tampered_file(self, temp_snapshots_dir, sample_filters_list):
+        """Test that edits to backup.json on disk fail verification."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        backup_file = manager.snapshot_dir_for("latest") / "backup.json"
+        data = json.loads(backup_file.read_text())
+        data["filters"][0]["name"] = "Tampered"
+        backup_file.write_text(json.dumps(data))
+
+        assert manager.verify_snapshot("latest") is False
+
+    def test_verify_snapshot_legacy_sha256_file(self, temp_snapshots_dir, sample_filters_list):
+        """Test verifying a backup.json written in the older sha256 format."""
+        manager = BackupManager(temp_snapshots_dir)
+        snapshot_dir = temp_snapshots_dir / "2025-01-01_00-00-00"
+        snapshot_dir.mkdir()
+        backup = Backup(filters=sample_filters_list)
+        checksum_json = json.dumps(
+            {"filters": [f.model_dump() for f in sample_filters_list], "sieve_script": ""},
+            sort_keys=True, default=str,
+        )
+        backup.checksum = "sha256:" + hashlib.sha256(checksum_json.encode()).hexdigest()
+        with open(snapshot_dir / "backup.json", "w") as f:
+            json.dump(backup.model_dump(), f, indent=2, default=str)
+
+        assert manager.verify_snapshot("2025-01-01_00-00-00") is True
+
     def test_verify_backup_tampered_data(self, temp_snapshots_dir, sample_filters_list):
         """Test verifying backup with tampered data."""
         manager = BackupManager(temp_snapshots_dir)
@@ -312,6 +463,40 @@ class TestBackupManager:
         assert backup.metadata.disabled_count == 0
         assert len(backup.filters) == 0
 
+    def test_backup_roundtrip_without_orjson(self, temp_snapshots_dir, sample_filters_list, monkeypatch):
+        """Test that the stdlib json fallback writes backups that load back intact."""
+        import src.backup.backup_manager as backup_manager
+        monkeypatch.setattr(backup_manager, "orjson", None)
+        manager = BackupManager(temp_snapshots_dir)
+        created = manager.create_backup(sample_filters_list, "test@proton.me", sieve_script="keep;")
+
+        loaded = manager.load_backup("latest")
+
+        assert loaded.filters == created.filters
+        assert loaded.sieve_script == "keep;"
+        assert loaded.timestamp == created.timestamp
+        assert manager.verify_backup(loaded) is True
+
+    def test_backup_file_matches_model_dump(self, temp_snapshots_dir, sample_filters_list):
+        """Test that backup.json holds exactly the JSON-mode dump of the returned backup."""
+        manager = BackupManager(temp_snapshots_dir)
+        backup = manager.create_backup(sample_filters_list, "test@proton.me", sieve_script="keep;")
+
+        data = json.loads((manager.snapshot_dir_for("latest") / "backup.json").read_text())
+
+        assert data == backup.model_dump(mode="json")
+
+    def test_backup_roundtrip_preserves_timestamp(self, temp_snapshots_dir, sample_filters_list):
+        """Test that the naive backup timestamp survives a save/load cycle unchanged."""
+        manager = BackupManager(temp_snapshots_dir)
+        created = manager.create_backup(sample_filters_list)
+
+        loaded = manager.load_backup("latest")
+
+        assert loaded.timestamp == created.timestamp
+        assert loaded.timestamp.tzinfo is None
+        assert manager.verify_backup(loaded) is True
+
 
 class TestManifest:
     """Test manifest methods."""
@@ -412,6 +597,232 @@ class TestManifest:
 
         assert hashes is None
 
+    def test_load_synced_hashes_picks_newest_synced(self, temp_snapshots_dir):
+        """Test that newer unsynced manifests are skipped in favour of the newest synced one."""
+        manager = BackupManager(temp_snapshots_dir)
+        manifests = {
+            "2025-01-01_00-00-00": {"synced_at": "2025-01-01T01:00:00", "filter_hashes": ["old"]},
+            "2025-01-02_00-00-00": {"synced_at": "2025-01-02T01:00:00", "filter_hashes": ["mid"]},
+            "2025-01-03_00-00-00": {"synced_at": None, "filter_hashes": ["new"]},
+        }
+        for name, manifest in manifests.items():
+            (temp_snapshots_dir / name).mkdir()
+            (temp_snapshots_dir / name / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        # A compact, hand-written unsynced manifest must still be parsed, not trusted
+        (temp_snapshots_dir / "2025-01-04_00-00-00").mkdir()
+        (temp_snapshots_dir / "2025-01-04_00-00-00" / "manifest.json").write_text(
+            '{"synced_at":null,"filter_hashes":["newest"]}'
+        )
+
+        assert manager.load_synced_hashes() == {"mid"}
+
+
+class TestUnchangedLatest:
+    """Test unchanged_latest() no-op backup detection."""
+
+    def test_same_content_matches(self, temp_snapshots_dir, sample_filters_list):
+        """Test that identical filters and script match the latest snapshot."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list, sieve_script="keep;")
+
+        assert manager.unchanged_latest(sample_filters_list, "keep;") == manager.snapshot_dir_for("latest").name
+
+    def test_changed_content_does_not_match(self, temp_snapshots_dir, sample_filters_list):
+        """Test that a changed script or filter set is not reported as unchanged."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list, sieve_script="keep;")
+
+        assert manager.unchanged_latest(sample_filters_list, "discard;") is None
+        assert manager.unchanged_latest(sample_filters_list[1:], "keep;") is None
+
+    def test_legacy_sha256_checksum(self, temp_snapshots_dir, sample_filters_list):
+        """Test that a snapshot checksummed with sha256 is compared in sha256."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        metadata_path = manager.snapshot_dir_for("latest") / "metadata.json"
+        metadata = json.loads(metadata_path.read_text())
+        checksum_json = json.dumps(
+            {"filters": [f.canonical_dump for f in sample_filters_list], "sieve_script": ""},
+            sort_keys=True, default=str,
+        )
+        metadata["checksum"] = "sha256:" + hashlib.sha256(checksum_json.encode()).hexdigest()
+        metadata_path.write_text(json.dumps(metadata))
+
+        assert manager.unchanged_latest(sample_filters_list) is not None
+
+    def test_no_snapshot(self, temp_snapshots_dir, sample_filters_list):
+        """Test that nothing matches without a latest snapshot."""
+        assert BackupManager(temp_snapshots_dir).unchanged_latest(sample_filters_list) is None
+
+    @pytest.mark.parametrize("content", ["{truncated", "[1, 2]", '{"checksum": 42}'])
+    def test_unreadable_metadata(self, temp_snapshots_dir, sample_filters_list, content):
+        """Test that a corrupt or non-object metadata.json never matches."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        (manager.snapshot_dir_for("latest") / "metadata.json").write_text(content)
+
+        assert manager.unchanged_latest(sample_filters_list) is None
+
+    def test_metadata_not_a_file(self, temp_snapshots_dir, sample_filters_list):
+        """Test that an OS error reading metadata.json never matches."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        metadata_path = manager.snapshot_dir_for("latest") / "metadata.json"
+        metadata_path.unlink()
+        metadata_path.mkdir()
+
+        assert manager.unchanged_latest(sample_filters_list) is None
+
+
+class TestLatestSnapshotAge:
+    """Test latest_snapshot_age()."""
+
+    def test_age_of_new_snapshot(self, temp_snapshots_dir, sample_filters_list):
+        """Test that a just-created snapshot is only a few seconds old."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+
+        age = manager.latest_snapshot_age()
+        assert age is not None
+        assert 0 <= age < 60
+
+    def test_no_snapshot(self, temp_snapshots_dir):
+        """Test that there is no age without a latest snapshot."""
+        assert BackupManager(temp_snapshots_dir).latest_snapshot_age() is None
+
+
+class TestWrittenSinceLatest:
+    """Test written_since_latest() and record_remote_write()."""
+
+    def test_untouched_snapshot(self, temp_snapshots_dir, sample_filters_list):
+        """Test that a snapshot with no later writes is current."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+
+        assert not manager.written_since_latest()
+
+    def test_recorded_write_after_snapshot(self, temp_snapshots_dir, sample_filters_list):
+        """Test that a write recorded after the snapshot makes it stale."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        manager.record_remote_write()
+
+        assert manager.written_since_latest()
+
+    def test_write_before_snapshot(self, temp_snapshots_dir, sample_filters_list):
+        """Test that a snapshot taken after the last write is current again."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.record_remote_write()
+        time.sleep(1)
+        manager.create_backup(sample_filters_list)
+
+        assert not manager.written_since_latest()
+
+    def test_synced_manifest_after_snapshot(self, temp_snapshots_dir, sample_filters_list):
+        """Test that a manifest synced after the snapshot counts as a write."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+        manager.write_manifest(snapshot_dir, sample_filters_list, "consolidated.sieve")
+        assert not manager.written_since_latest()
+
+        manager.promote_manifest(snapshot_dir)
+        assert manager.written_since_latest()
+
+    def test_unreadable_marker(self, temp_snapshots_dir, sample_filters_list):
+        """Test that a marker that can't be parsed is treated as a write."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        (temp_snapshots_dir / ".last_remote_write").write_text("garbage")
+
+        assert manager.written_since_latest()
+
+    def test_marker_not_listed(self, temp_snapshots_dir, sample_filters_list):
+        """Test that the marker file is not mistaken for a snapshot."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        manager.record_remote_write()
+
+        assert len(manager.list_backups()) == 1
+
+
+class TestConsolidationArgs:
+    """Test consolidation_args.json methods."""
+
+    def test_round_trip(self, temp_snapshots_dir, sample_filters_list):
+        """Test writing and loading consolidation args."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+        args = {"exclude": ["Filter 1"], "include_disabled": False, "created_at": "2026-02-12T14:30:00+00:00"}
+
+        manager.write_consolidation_args(snapshot_dir, args)
+
+        assert json.loads((snapshot_dir / "consolidation_args.json").read_text()) == args
+        assert manager.load_consolidation_args(snapshot_dir) == args
+
+    def test_load_missing(self, temp_snapshots_dir, sample_filters_list):
+        """Test loading consolidation args when none exist."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+
+        assert manager.load_consolidation_args(manager.snapshot_dir_for("latest")) is None
+
+
+class TestSetFilterStatuses:
+    """Test batched archive status updates."""
+
+    def test_batch_updates_creates_and_reports_missing(self, temp_snapshots_dir, sample_filters_list, monkeypatch):
+        """Test that one call updates, creates and reports missing names with a single write."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+        archived = sample_filters_list[0].model_copy(update={"status": FilterStatus.ARCHIVED})
+        manager.write_archive(snapshot_dir, [ArchiveEntry(filter=archived)])
+
+        writes = []
+        original_write = manager.write_archive
+        monkeypatch.setattr(manager, "write_archive", lambda d, e: (writes.append(d), original_write(d, e)))
+
+        results = manager.set_filter_statuses("latest", {
+            "Spam Filter 1": FilterStatus.DEPRECATED,
+            "Move to Spam": FilterStatus.DISABLED,
+            "Missing": FilterStatus.ENABLED,
+        })
+
+        assert results == {"Spam Filter 1": "updated", "Move to Spam": "created", "Missing": "not_found"}
+        assert len(writes) == 1
+        by_name = {e.filter.name: e.filter for e in manager.load_archive(snapshot_dir)}
+        assert by_name["Spam Filter 1"].status == FilterStatus.DEPRECATED
+        assert by_name["Move to Spam"].status == FilterStatus.DISABLED
+        assert by_name["Move to Spam"].enabled is False
+
+    def test_unchanged_does_not_write(self, temp_snapshots_dir, sample_filters_list):
+        """Test that setting an archive entry to its current status leaves archive.json alone."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+        archived = sample_filters_list[0].model_copy(update={"status": FilterStatus.ARCHIVED, "enabled": False})
+        manager.write_archive(snapshot_dir, [ArchiveEntry(filter=archived)])
+        archive_path = snapshot_dir / "archive.json"
+        archive_path.write_bytes(archive_path.read_bytes() + b"\n")
+        before = archive_path.read_bytes()
+
+        results = manager.set_filter_statuses("latest", {"Spam Filter 1": FilterStatus.ARCHIVED})
+
+        assert results == {"Spam Filter 1": "unchanged"}
+        assert archive_path.read_bytes() == before
+
+    def test_all_missing_does_not_write(self, temp_snapshots_dir, sample_filters_list):
+        """Test that archive.json is not created when no name matches."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+
+        results = manager.set_filter_statuses("latest", {"Missing": FilterStatus.ENABLED})
+
+        assert results == {"Missing": "not_found"}
+        assert not (manager.snapshot_dir_for("latest") / "archive.json").exists()
+
 
 class TestArchiveIO:
     """Test archive read/write methods."""
@@ -483,17 +894,29 @@ class TestArchiveIO:
         loaded = manager.load_archive(second_dir)
         assert len(loaded) == 1
         assert loaded[0].filter.name == "Carried"
+        assert (second_dir / "archive.json").read_bytes() == (first_dir / "archive.json").read_bytes()
+
+    def test_carry_forward_archive_copies_without_parsing(self, temp_snapshots_dir, sample_filters_list):
+        """Test that the previous archive is copied byte for byte, not validated."""
+        manager = BackupManager(temp_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        (manager.snapshot_dir_for("latest") / "archive.json").write_bytes(b"not parsed")
+
+        target = temp_snapshots_dir / "test-target"
+        target.mkdir()
+        assert manager.carry_forward_archive(target) is True
+        assert (target / "archive.json").read_bytes() == b"not parsed"
 
     def test_carry_forward_archive_without_previous(self, temp_snapshots_dir, sample_filters_list):
         """Test carry forward when no previous archive exists."""
         manager = BackupManager(temp_snapshots_dir)
         manager.create_backup(sample_filters_list)
 
-        # No archive in first snapshot — carry_forward should return empty
+        # No archive in first snapshot — nothing is carried forward
         target = temp_snapshots_dir / "test-target"
         target.mkdir()
-        carried = manager.carry_forward_archive(target)
-        assert carried == []
+        assert manager.carry_forward_archive(target) is False
+        assert not (target / "archive.json").exists()
 
     def test_carry_forward_does_not_self_copy(self, temp_snapshots_dir, sample_filters_list):
         """Test that carry forward doesn't copy from self."""
@@ -504,9 +927,9 @@ class TestArchiveIO:
         entries = [self._make_entry("Test")]
         manager.write_archive(snapshot_dir, entries)
 
-        # carry_forward from latest to itself should return empty
-        carried = manager.carry_forward_archive(snapshot_dir)
-        assert carried == []
+        # carry_forward from latest to itself should do nothing
+        assert manager.carry_forward_archive(snapshot_dir) is False
+        assert len(manager.load_archive(snapshot_dir)) == 1
 
     def test_create_backup_carries_forward_archive(self, temp_snapshots_dir, sample_filters_list):
         """Test that create_backup automatically carries forward archive."""
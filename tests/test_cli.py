@@ -0,0 +1,327 @@
+"""Tests for the top-level CLI commands (consolidate, sync, backup, diff, cleanup, restore, list-snapshots).
+
+Browser-driven commands run against the in-memory fakes from the
+fake_session fixture in conftest.py.
+"""
+
+import time
+
+import pytest
+
+from typer.testing import CliRunner
+
+from src.main import app
+from src.backup.backup_manager import BackupManager
+from src.models.filter_models import FilterStatus
+from src.models.backup_models import ArchiveEntry
+
+
+runner = CliRunner()
+
+pytestmark = pytest.mark.usefixtures("wide_console")
+
+
+class TestConsolidateArchiveOverrides:
+    """Tests for how consolidate applies archive entries to backup filters."""
+
+    def test_deprecated_skipped_and_disabled_override_applied(self, cli_snapshots_dir, sample_filters_list):
+        """Test that deprecated entries drop the backup filter and other statuses replace it."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+
+        deprecated = sample_filters_list[0].model_copy(deep=True)
+        deprecated.status = FilterStatus.DEPRECATED
+        disabled = sample_filters_list[1].model_copy(deep=True)
+        disabled.status = FilterStatus.DISABLED
+        manager.write_archive(snapshot_dir, [ArchiveEntry(filter=deprecated), ArchiveEntry(filter=disabled)])
+
+        result = runner.invoke(app, ["consolidate"])
+        assert result.exit_code == 0
+
+        manifest = manager.load_manifest(snapshot_dir)
+        assert "Spam Filter 1" not in manifest["filter_names"]
+        assert "Move to Spam" not in manifest["filter_names"]
+        assert "spam@example.com" not in (snapshot_dir / "consolidated.sieve").read_text()
+
+    def test_included_filters_archived_once(self, cli_snapshots_dir, sample_filters_list):
+        """Test that consolidate archives included filters without duplicating on rerun."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+
+        assert runner.invoke(app, ["consolidate"]).exit_code == 0
+        names = sorted(e.filter.name for e in manager.load_archive(snapshot_dir))
+        assert names == ["Move to Spam", "Spam Filter 1"]
+
+        assert runner.invoke(app, ["consolidate"]).exit_code == 0
+        assert len(manager.load_archive(snapshot_dir)) == 2
+
+    def test_include_args_from_reuses_excludes(self, cli_snapshots_dir, sample_filters_list):
+        """Test that saved --exclude names are applied again via --include-args-from."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+
+        assert runner.invoke(app, ["consolidate", "--exclude", "Spam Filter 1"]).exit_code == 0
+        assert manager.load_consolidation_args(snapshot_dir)["exclude"] == ["Spam Filter 1"]
+
+        result = runner.invoke(app, ["consolidate", "--include-args-from", "latest"])
+        assert result.exit_code == 0
+        assert "+1 excludes" in result.output
+        assert "Spam Filter 1" not in manager.load_manifest(snapshot_dir)["filter_names"]
+        assert manager.load_consolidation_args(snapshot_dir)["exclude"] == ["Spam Filter 1"]
+
+
+class TestBackupSkipUnchanged:
+    """Tests for backup --skip-unchanged."""
+
+    def test_unchanged_account_creates_no_snapshot(self, cli_snapshots_dir, fake_session):
+        """Test that a second identical backup is skipped."""
+        fake_session.scraper.raw_filters = [{"name": "Spam", "enabled": True, "actions": [{"type": "delete"}]}]
+        fake_session.scraper.sieve_script = "keep;"
+        fake_session.scraper.account_email = "user@proton.me"
+
+        assert runner.invoke(app, ["backup", "--skip-unchanged"]).exit_code == 0
+        result = runner.invoke(app, ["backup", "--skip-unchanged"])
+        assert result.exit_code == 0, result.output
+        assert "No changes since snapshot" in result.output
+        assert len(BackupManager(cli_snapshots_dir).list_backups()) == 1
+
+
+class TestSyncSnapshotReuse:
+    """Tests for sync --max-snapshot-age reusing the snapshot's Sieve script."""
+
+    def test_fresh_snapshot_script_is_merged_without_reading(self, cli_snapshots_dir, sample_filters_list, fake_session):
+        """Test that a recent snapshot's script stands in for the live read."""
+        user_rules = 'if header :contains "subject" "keep" { keep; }'
+        BackupManager(cli_snapshots_dir).create_backup(sample_filters_list, sieve_script=user_rules)
+        assert runner.invoke(app, ["consolidate"]).exit_code == 0
+
+        result = runner.invoke(app, ["sync", "--credentials-file", fake_session.creds, "--max-snapshot-age", "600"])
+        assert result.exit_code == 0, result.output
+        (sync_client,) = fake_session.sync.instances
+        assert sync_client.sieve_reads == 0
+        assert user_rules in sync_client.uploaded
+        assert BackupManager(cli_snapshots_dir).written_since_latest()
+
+    def test_empty_snapshot_script_still_reads_live(self, cli_snapshots_dir, sample_filters_list, fake_session):
+        """Test that an empty snapshot script is not trusted."""
+        BackupManager(cli_snapshots_dir).create_backup(sample_filters_list)
+        assert runner.invoke(app, ["consolidate"]).exit_code == 0
+
+        result = runner.invoke(app, ["sync", "--credentials-file", fake_session.creds, "--max-snapshot-age", "600"])
+        assert result.exit_code == 0, result.output
+        assert fake_session.sync.instances[0].sieve_reads == 1
+
+    def test_sync_after_snapshot_reads_live(self, cli_snapshots_dir, sample_filters_list, fake_session):
+        """Test that a manifest synced after the snapshot forces the live read."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list, sieve_script='if true { keep; }')
+        assert runner.invoke(app, ["consolidate"]).exit_code == 0
+        manager.promote_manifest(manager.snapshot_dir_for("latest"))
+        live_rules = 'if header :contains "subject" "live" { keep; }'
+        fake_session.sync.live_sieve = live_rules
+
+        result = runner.invoke(app, ["sync", "--credentials-file", fake_session.creds, "--max-snapshot-age", "600"])
+        assert result.exit_code == 0, result.output
+        assert "reading it live" in result.output
+        (sync_client,) = fake_session.sync.instances
+        assert sync_client.sieve_reads == 1
+        assert live_rules in sync_client.uploaded
+
+
+class TestSyncDryRun:
+    """Tests for sync --dry-run, which never logs in."""
+
+    def test_dry_run_does_not_load_credentials(self, cli_snapshots_dir, sample_filters_list, tmp_path):
+        """Test that dry-run previews without reading the credentials file."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        assert runner.invoke(app, ["consolidate"]).exit_code == 0
+
+        missing = tmp_path / "no-such-credentials"
+        result = runner.invoke(app, ["sync", "--dry-run", "--credentials-file", str(missing)])
+        assert result.exit_code == 0
+        assert "DRY RUN" in result.output
+
+
+class TestDiffCommand:
+    """Tests for diff --backup against a (faked) live account."""
+
+    def test_diff_backup_vs_current(self, cli_snapshots_dir, sample_filters_list, fake_session):
+        """Test that backup filters missing from the account show as removed."""
+        BackupManager(cli_snapshots_dir).create_backup(sample_filters_list)
+
+        result = runner.invoke(app, ["diff", "--backup", "latest"])
+        assert result.exit_code == 0
+        assert "Spam Filter 1" in result.output
+
+    def test_diff_truncates_long_sections(self, cli_snapshots_dir, sample_filters_list, fake_session):
+        """Test that sections list ten filters and count the rest."""
+        filters = []
+        for i in range(12):
+            f = sample_filters_list[0].model_copy(deep=True)
+            f.name = f"Rule {i}"
+            filters.append(f)
+        BackupManager(cli_snapshots_dir).create_backup(filters)
+
+        result = runner.invoke(app, ["diff", "--backup", "latest"])
+        assert result.exit_code == 0
+        assert "- Rule 9" in result.output
+        assert "- Rule 10" not in result.output
+        assert "... and 2 more" in result.output
+
+    def test_diff_unknown_backup_fails_before_browser(self, cli_snapshots_dir, fake_session):
+        """Test that an unknown snapshot is rejected without starting a scraper."""
+        result = runner.invoke(app, ["diff", "--backup", "2000-01-01_00-00-00"])
+        assert isinstance(result.exception, FileNotFoundError)
+        assert fake_session.scraper.instances == []
+
+    def test_diff_login_failure_settles_backup_load(self, cli_snapshots_dir, sample_filters_list, fake_session,
+                                                     monkeypatch, caplog):
+        """Test that a failed login still retrieves the background backup load and closes the browser."""
+        import asyncio
+        import gc
+
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+
+        def _corrupt_load(self, backup_id="latest"):
+            raise ValueError("corrupt backup")
+
+        async def _failed_login(self):
+            await asyncio.sleep(0.05)  # let the load finish (and fail) first
+            raise RuntimeError("login failed")
+
+        monkeypatch.setattr(BackupManager, "load_backup", _corrupt_load)
+        monkeypatch.setattr(fake_session.scraper, "login", _failed_login)
+
+        result = runner.invoke(app, ["diff", "--backup", "latest"])
+        assert isinstance(result.exception, RuntimeError)
+        assert fake_session.scraper.instances[0].closed
+
+        # The traceback pins the task; drop it so an unretrieved error is reported now
+        result.exception.__traceback__ = None
+        del result
+        gc.collect()
+        assert "never retrieved" not in caplog.text
+
+
+class TestCleanupCommand:
+    """Tests for cleanup deleting through the scraper's browser session."""
+
+    @pytest.fixture(autouse=True)
+    def _one_disabled_filter(self, fake_session):
+        """Have the fake account report one disabled and one enabled filter."""
+        fake_session.scraper.raw_filters = [
+            {"name": "Old Rule", "enabled": False},
+            {"name": "Live Rule", "enabled": True},
+        ]
+
+    def test_confirm_deletes_in_scraper_session(self, fake_session):
+        """Test that confirming deletes through the scraper's session without a second login."""
+        result = runner.invoke(app, ["cleanup", "--credentials-file", fake_session.creds], input="y\n")
+        assert result.exit_code == 0
+        (sync_client,) = fake_session.sync.instances
+        assert sync_client.adopted
+        assert not sync_client.logged_in
+        assert sync_client.deleted == ["Old Rule"]
+        assert sync_client.closed
+
+    def test_decline_starts_no_sync_client(self, fake_session):
+        """Test that declining deletes nothing and never hands the session over."""
+        result = runner.invoke(app, ["cleanup", "--credentials-file", fake_session.creds], input="n\n")
+        assert result.exit_code == 0
+        assert "Cleanup cancelled" in result.output
+        assert fake_session.sync.instances == []
+
+
+class TestRestoreCommand:
+    """Tests for restore's browser session handling."""
+
+    def test_restore_with_credentials(self, cli_snapshots_dir, sample_filters_list, fake_session):
+        """Test that restore toggles in the scraper's session and closes it."""
+        BackupManager(cli_snapshots_dir).create_backup(sample_filters_list)
+
+        result = runner.invoke(app, ["restore", "--backup", "latest", "--credentials-file", fake_session.creds])
+        assert result.exit_code == 0
+        assert "Restore complete" in result.output
+        (sync_client,) = fake_session.sync.instances
+        assert sync_client.adopted
+        assert not sync_client.logged_in
+        assert sync_client.closed
+
+    @pytest.fixture
+    def older_target(self, cli_snapshots_dir, sample_filters_list):
+        """Back up the sample filters, then take a newer latest with Spam Filter 1 disabled."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        target = manager.snapshot_dir_for("latest").name
+        time.sleep(1)
+        changed = [f.model_copy(deep=True) for f in sample_filters_list]
+        changed[0].enabled = False
+        changed[0].status = FilterStatus.DISABLED
+        manager.create_backup(changed)
+        return target
+
+    def test_restore_reuses_fresh_snapshot(self, cli_snapshots_dir, older_target, fake_session):
+        """Test that a recent enough latest snapshot replaces the scrape."""
+        result = runner.invoke(app, [
+            "restore", "--backup", older_target, "--credentials-file", fake_session.creds, "--max-snapshot-age", "600",
+        ])
+        assert result.exit_code == 0, result.output
+        assert "skipping scrape" in result.output
+        assert fake_session.scraper.instances == []
+        (sync_client,) = fake_session.sync.instances
+        assert sync_client.toggled == [("Spam Filter 1", True)]
+        assert sync_client.closed
+        # The toggles make the snapshot unusable for the next run
+        assert BackupManager(cli_snapshots_dir).written_since_latest()
+
+    def test_restore_latest_always_scrapes(self, cli_snapshots_dir, sample_filters_list, fake_session):
+        """Test that restoring the latest snapshot never compares it with itself."""
+        BackupManager(cli_snapshots_dir).create_backup(sample_filters_list)
+
+        result = runner.invoke(app, [
+            "restore", "--backup", "latest", "--credentials-file", fake_session.creds, "--max-snapshot-age", "600",
+        ])
+        assert result.exit_code == 0, result.output
+        assert "can't stand in for current state" in result.output
+        assert len(fake_session.scraper.instances) == 1
+
+    def test_restore_scrapes_after_remote_write(self, cli_snapshots_dir, older_target, fake_session):
+        """Test that a change to the account after the snapshot forces a scrape."""
+        BackupManager(cli_snapshots_dir).record_remote_write()
+
+        result = runner.invoke(app, [
+            "restore", "--backup", older_target, "--credentials-file", fake_session.creds, "--max-snapshot-age", "600",
+        ])
+        assert result.exit_code == 0, result.output
+        assert "reading it live" in result.output
+        assert "skipping scrape" not in result.output
+        assert len(fake_session.scraper.instances) == 1
+
+
+class TestListSnapshots:
+    """Tests for the list-snapshots command."""
+
+    def test_list_shows_archive_counts(self, cli_snapshots_dir, sample_filters_list):
+        """Test that each snapshot row shows the size of its archive."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+        entries = []
+        for i in range(5):
+            f = sample_filters_list[0].model_copy(deep=True)
+            f.name = f"Archived {i}"
+            f.conditions[0].value = f"old{i}@test.com"
+            f.status = FilterStatus.ARCHIVED
+            entries.append(ArchiveEntry(filter=f))
+        manager.write_archive(snapshot_dir, entries)
+
+        result = runner.invoke(app, ["list-snapshots"])
+        assert result.exit_code == 0
+        row = next(line for line in result.output.splitlines() if snapshot_dir.name in line)
+        cells = [c.strip() for c in row.split("│")]
+        assert cells[6] == "5"
@@ -133,6 +133,24 @@ class TestGroupByAction:
 
         assert len(result) == 2
 
+    def test_parameter_order_does_not_split_groups(self):
+        """Test that filters differing only in parameter order are grouped."""
+        filters = [
+            ProtonMailFilter(
+                name="Move 1",
+                actions=[FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "News", "label": "n"})]
+            ),
+            ProtonMailFilter(
+                name="Move 2",
+                actions=[FilterAction(type=ActionType.MOVE_TO, parameters={"label": "n", "folder": "News"})]
+            ),
+        ]
+
+        result = group_by_action(filters)
+
+        assert len(result) == 1
+        assert result[0].source_filters == ["Move 1", "Move 2"]
+
     def test_source_filters_tracked(self):
         """Test that source filter names are tracked."""
         filters = [
@@ -158,6 +176,22 @@ class TestGroupByAction:
         assert "Delete" in result[0].name
         assert "consolidated from 2 filters" in result[0].name
 
+    def test_consolidated_name_follows_action_order(self):
+        """Test that multi-action names list actions in the first filter's order."""
+        actions = [
+            FilterAction(type=ActionType.STAR),
+            FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work"}),
+        ]
+        filters = [
+            ProtonMailFilter(name="F1", actions=actions),
+            ProtonMailFilter(name="F2", actions=list(reversed(actions))),
+        ]
+
+        result = group_by_action(filters)
+
+        assert len(result) == 1
+        assert result[0].name == "Star + Move to Work (consolidated from 2 filters)"
+
     def test_preserves_and_logic_in_condition_group(self):
         """Test that a filter with AND logic keeps its conditions as an AND group."""
         filters = [
@@ -330,6 +364,20 @@ class TestMergeConditions:
         assert "spam3" in merged_value
         assert "|" in merged_value
 
+    def test_merge_drops_duplicate_values(self):
+        """Test that repeated values appear once in the merged array, in first-seen order."""
+        groups = [
+            ConditionGroup(conditions=[FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value=v)])
+            for v in ["bob", "alice", "bob", "carol", "alice"]
+        ]
+        cf = ConsolidatedFilter(name="CF", condition_groups=groups, filter_count=5)
+
+        result = merge_conditions([cf])
+
+        assert len(result[0].condition_groups) == 1
+        assert result[0].condition_groups[0].conditions[0].value == "bob|alice|carol"
+        assert result[0].condition_groups[0].conditions[0].values == ["bob", "alice", "carol"]
+
     def test_different_types_not_merged(self):
         """Test that single-condition groups with different types are not merged."""
         cf = ConsolidatedFilter(
@@ -442,6 +490,49 @@ class TestMergeConditions:
         assert "|" in singles[0].conditions[0].value  # merged
         assert multis[0].logic == LogicType.AND
 
+    def test_nothing_to_merge_returned_as_is(self):
+        """Test that filters with at most one condition group are passed through untouched."""
+        filters = [
+            ConsolidatedFilter(name="A", condition_groups=[ConditionGroup(conditions=[
+                FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="a"),
+            ])]),
+            ConsolidatedFilter(name="B"),
+        ]
+
+        assert merge_conditions(filters) is filters
+
+    def test_unmergeable_groups_returned_as_is(self):
+        """Test that distinct single groups ahead of multi groups are left untouched."""
+        groups = [
+            ConditionGroup(conditions=[FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="a")]),
+            ConditionGroup(conditions=[FilterCondition(type=ConditionType.SUBJECT, operator=Operator.CONTAINS, value="b")]),
+            ConditionGroup(conditions=[
+                FilterCondition(type=ConditionType.SENDER, operator=Operator.IS, value="c"),
+                FilterCondition(type=ConditionType.SUBJECT, operator=Operator.IS, value="d"),
+            ]),
+        ]
+        filters = [ConsolidatedFilter(name="CF", condition_groups=groups, filter_count=3)]
+
+        result = merge_conditions(filters)
+
+        assert result is filters
+        assert result[0] is filters[0]
+
+    def test_single_after_multi_group_still_reordered(self):
+        """Test that a single group following a multi group still moves ahead of it."""
+        multi = ConditionGroup(conditions=[
+            FilterCondition(type=ConditionType.SENDER, operator=Operator.IS, value="c"),
+            FilterCondition(type=ConditionType.SUBJECT, operator=Operator.IS, value="d"),
+        ])
+        single = ConditionGroup(conditions=[
+            FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="a"),
+        ])
+        filters = [ConsolidatedFilter(name="CF", condition_groups=[multi, single], filter_count=2)]
+
+        result = merge_conditions(filters)
+
+        assert result[0].condition_groups == [single, multi]
+
 
 class TestOptimizeOrdering:
     """Test optimize_ordering strategy."""
@@ -506,6 +597,27 @@ class TestOptimizeOrdering:
         assert result[1].filter_count == 3
         assert result[2].filter_count == 1
 
+    def test_ties_keep_input_order(self):
+        """Test that filters with equal keys keep their relative order."""
+        filters = [
+            ConsolidatedFilter(name="No actions", filter_count=9),
+            ConsolidatedFilter(name="Star A", actions=[FilterAction(type=ActionType.STAR)], filter_count=2),
+            ConsolidatedFilter(name="Star B", actions=[FilterAction(type=ActionType.STAR)], filter_count=2),
+        ]
+
+        result = optimize_ordering(filters)
+
+        assert [f.name for f in result] == ["Star A", "Star B", "No actions"]
+
+    def test_already_ordered_returned_as_is(self):
+        """Test that input already in priority order is returned without copying."""
+        filters = [
+            ConsolidatedFilter(name="Delete", actions=[FilterAction(type=ActionType.DELETE)], filter_count=2),
+            ConsolidatedFilter(name="Star", actions=[FilterAction(type=ActionType.STAR)], filter_count=1),
+        ]
+
+        assert optimize_ordering(filters) is filters
+
 
 class TestConsolidationEngine:
     """Test ConsolidationEngine class."""
@@ -579,6 +691,50 @@ class TestConsolidationEngine:
         assert report.consolidated_count > 0
         assert report.reduction_percent > 0
 
+    def test_consolidate_report_groups(self):
+        """Test that report.groups sums merged filter counts per action label."""
+        def make(name, actions):
+            return ProtonMailFilter(
+                name=name,
+                conditions=[FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value=name)],
+                actions=actions,
+            )
+
+        filters = [
+            make("Spam 1", [FilterAction(type=ActionType.DELETE)]),
+            make("Spam 2", [FilterAction(type=ActionType.DELETE)]),
+            make("Work 1", [FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work"})]),
+            make("Work 2", [FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work"}),
+                            FilterAction(type=ActionType.MARK_READ)]),
+        ]
+        engine = ConsolidationEngine()
+
+        _, report = engine.consolidate(filters)
+
+        assert report.groups == {"delete": 2, "move_to (Work)": 2, "mark_read": 1}
+
+    def test_consolidate_report_groups_repeated_label(self):
+        """Test that two actions with the same report label both count."""
+        filters = [
+            ProtonMailFilter(name="Tagged", actions=[
+                FilterAction(type=ActionType.LABEL, parameters={"label": "A"}),
+                FilterAction(type=ActionType.LABEL, parameters={"label": "B"}),
+            ]),
+        ]
+        engine = ConsolidationEngine()
+
+        _, report = engine.consolidate(filters)
+
+        assert report.groups == {"label": 2}
+
+    def test_report_uses_slots(self):
+        """ConsolidationReport is slotted: no per-instance __dict__, no stray attributes."""
+        report = ConsolidationReport()
+
+        assert not hasattr(report, "__dict__")
+        with pytest.raises(AttributeError):
+            report.typo_field = 1
+
     def test_consolidate_reduction_percent(self):
         """Test reduction percentage calculation."""
         filters = [
@@ -650,6 +806,33 @@ class TestConsolidationEngine:
         assert "consolidation_opportunities" in analysis
         assert len(analysis["consolidation_opportunities"]) > 0
 
+    def test_analyze_distributions(self):
+        """Test action/condition distribution labels, counts and ordering."""
+        def make(name, cond_type, actions):
+            return ProtonMailFilter(
+                name=name,
+                conditions=[FilterCondition(type=cond_type, operator=Operator.CONTAINS, value=name)],
+                actions=actions,
+            )
+
+        work = FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work"})
+        filters = [
+            make("W1", ConditionType.SENDER, [work]),
+            make("W2", ConditionType.SENDER, [work]),
+            make("W3", ConditionType.SUBJECT, [work, FilterAction(type=ActionType.STAR)]),
+            make("D1", ConditionType.SENDER, [FilterAction(type=ActionType.DELETE)]),
+        ]
+        engine = ConsolidationEngine()
+
+        analysis = engine.analyze(filters)
+
+        assert list(analysis["action_distribution"].items()) == [
+            ("move_to -> Work", 3), ("star", 1), ("delete", 1),
+        ]
+        assert list(analysis["condition_distribution"].items()) == [("sender", 3), ("subject", 1)]
+        assert analysis["consolidation_opportunities"] == {"move_to -> Work": 3}
+        assert analysis["potential_reduction"] == 3
+
     def test_full_consolidation_pipeline(self):
         """Test complete consolidation pipeline with all strategies."""
         filters = [
@@ -778,6 +961,46 @@ class TestConsolidationEngine:
         assert "spam1" in merged_singles[0].conditions[0].value
         assert "spam2" in merged_singles[0].conditions[0].value
 
+    def test_fused_pipeline_matches_chained_strategies(self):
+        """Test that consolidate gives the same result as chaining the strategy functions."""
+        filters = [
+            ProtonMailFilter(
+                name="Spam 1",
+                conditions=[FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="spam1")],
+                actions=[FilterAction(type=ActionType.DELETE)],
+            ),
+            ProtonMailFilter(
+                name="Spam 2",
+                logic=LogicType.AND,
+                conditions=[
+                    FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="spam2"),
+                    FilterCondition(type=ConditionType.SUBJECT, operator=Operator.CONTAINS, value="win"),
+                ],
+                actions=[FilterAction(type=ActionType.DELETE)],
+            ),
+            ProtonMailFilter(
+                name="Spam 3",
+                conditions=[FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="spam3")],
+                actions=[FilterAction(type=ActionType.DELETE)],
+            ),
+            ProtonMailFilter(
+                name="News",
+                conditions=[FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="news")],
+                actions=[FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "News"})],
+            ),
+            ProtonMailFilter(
+                name="Star",
+                conditions=[FilterCondition(type=ConditionType.SUBJECT, operator=Operator.IS, value="vip")],
+                actions=[FilterAction(type=ActionType.STAR)],
+            ),
+        ]
+        engine = ConsolidationEngine()
+
+        consolidated, _ = engine.consolidate(filters)
+
+        chained = optimize_ordering(merge_conditions(group_by_action(filters)))
+        assert consolidated == chained
+
 
 class TestDisabledFilterHandling:
     """Test include_disabled and synced_filter_hashes parameters."""
@@ -1073,6 +1296,29 @@ class TestStatusBasedSelection:
         assert "Skip" not in all_sources
         assert report.excluded_count == 1
 
+    def test_excluded_deprecated_not_counted(self):
+        """A deprecated filter is skipped, not counted as excluded, even if named."""
+        filters = [
+            self._make_filter("Keep"),
+            self._make_filter("Old", status=FilterStatus.DEPRECATED),
+        ]
+        engine = ConsolidationEngine()
+
+        consolidated, report = engine.consolidate(filters, exclude_names={"Old"})
+
+        assert report.excluded_count == 0
+        assert report.enabled_count == 1
+
+    def test_stale_exclude_names_ignored(self):
+        """Exclude names that match no current filter exclude nothing."""
+        filters = [self._make_filter("Keep"), self._make_filter("Also keep")]
+        engine = ConsolidationEngine()
+
+        consolidated, report = engine.consolidate(filters, exclude_names={"Gone", "Renamed"})
+
+        assert report.excluded_count == 0
+        assert report.enabled_count == 2
+
     def test_exclude_names_applies_to_archived(self):
         """Exclude names also apply to archived filters."""
         archived_filters = [
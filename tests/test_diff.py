@@ -67,6 +67,18 @@ class TestDiffEngine:
 
         assert len(diff.added) == 2
 
+    def test_diff_preserves_input_order(self):
+        """Test that results follow old-list order, then new-only filters in new-list order."""
+        engine = DiffEngine()
+        old = [ProtonMailFilter(name=n) for n in ["c", "a", "gone2", "b", "gone1"]]
+        new = [ProtonMailFilter(name=n) for n in ["new2", "b", "a", "new1", "c"]]
+
+        diff = engine.compare_filter_lists(old, new)
+
+        assert [f.name for f in diff.unchanged] == ["c", "a", "b"]
+        assert [f.name for f in diff.removed] == ["gone2", "gone1"]
+        assert [f.name for f in diff.added] == ["new2", "new1"]
+
     def test_detect_multiple_removed(self, sample_filter_spam, sample_filter_move):
         """Test detecting multiple removed filters."""
         engine = DiffEngine()
@@ -353,6 +365,26 @@ class TestDiffEngine:
 
         assert engine._filters_equal_except_enabled(f1, f2)
 
+    def test_filters_equal_except_enabled_dumps_once(self, monkeypatch):
+        """Test that repeated comparisons reuse each filter's cached dump."""
+        engine = DiffEngine()
+        f1 = ProtonMailFilter(name="Test", enabled=True)
+        f2 = ProtonMailFilter(name="Test", enabled=False)
+        calls = []
+        original = ProtonMailFilter.model_dump
+
+        def counting_dump(self, *args, **kwargs):
+            calls.append(self.name)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(ProtonMailFilter, "model_dump", counting_dump)
+
+        for _ in range(5):
+            assert engine._filters_equal_except_enabled(f1, f2)
+            assert not engine._filters_equal(f1, f2)
+
+        assert len(calls) == 2
+
 
 class TestStatusAwareDiff:
     """Test diff engine with FilterStatus changes."""
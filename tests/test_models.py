@@ -58,6 +58,12 @@ class TestFilterCondition:
         assert cond.operator == Operator.CONTAINS
         assert cond.value == "urgent"
 
+    def test_condition_values_not_serialized(self):
+        """Test that the merged values list never reaches model_dump."""
+        cond = FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="a|b", values=["a", "b"])
+        assert cond.values == ["a", "b"]
+        assert cond.model_dump(mode="json") == {"type": "sender", "operator": "contains", "value": "a|b"}
+
 
 class TestFilterAction:
     """Test FilterAction model."""
@@ -98,6 +104,30 @@ class TestFilterAction:
         assert action.type == ActionType.MARK_READ
         assert action.parameters == {}
 
+    def test_action_key_cached_and_invalidated(self):
+        """Test that FilterAction.key is cached and refreshed on assignment."""
+        action = FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work"})
+        assert action.key == ("move_to", (("folder", "Work"),))
+        assert action.key is action.key
+
+        action.parameters = {"folder": "Home"}
+
+        assert action.key == ("move_to", (("folder", "Home"),))
+        assert "key" not in action.model_dump()
+
+    def test_action_group_label(self):
+        """Test that the report labels add the folder when present and track assignment."""
+        action = FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work"})
+        assert action.group_label == "move_to (Work)"
+        assert FilterAction(type=ActionType.STAR).group_label == "star"
+
+        assert action.analysis_label == "move_to -> Work"
+
+        action.parameters = {}
+
+        assert action.group_label == "move_to"
+        assert action.analysis_label == "move_to"
+
 
 class TestProtonMailFilter:
     """Test ProtonMailFilter model."""
@@ -186,6 +216,101 @@ class TestProtonMailFilter:
         assert f.conditions == []
         assert f.actions == []
 
+    def test_canonical_dump_is_cached(self):
+        """Test that canonical_dump is computed once and matches a JSON-mode dump."""
+        f = ProtonMailFilter(name="Cached", conditions=[
+            FilterCondition(type=ConditionType.SENDER, operator=Operator.CONTAINS, value="a@test.com"),
+        ])
+        assert f.canonical_dump == f.model_dump(mode="json")
+        assert f.canonical_dump is f.canonical_dump
+
+    def test_canonical_dump_invalidated_on_assignment(self):
+        """Test that assigning a field refreshes canonical_dump."""
+        f = ProtonMailFilter(name="Cached")
+        assert f.canonical_dump["status"] == "enabled"
+
+        f.status = FilterStatus.ARCHIVED
+        f.enabled = False
+
+        assert f.canonical_dump["status"] == "archived"
+        assert f.canonical_dump["enabled"] is False
+
+    def test_canonical_dump_not_carried_into_copy_update(self):
+        """Test that model_copy(update=...) doesn't reuse the original's cached dump."""
+        f = ProtonMailFilter(name="Original")
+        _ = f.canonical_dump
+
+        copied = f.model_copy(update={"name": "Renamed"})
+
+        assert copied.canonical_dump["name"] == "Renamed"
+        assert f.canonical_dump["name"] == "Original"
+
+    def test_canonical_dump_excluded_from_serialization(self):
+        """Test that the cached dump never leaks into model_dump or equality."""
+        f = ProtonMailFilter(name="Cached")
+        _ = f.canonical_dump
+
+        assert "canonical_dump" not in f.model_dump()
+        assert f == ProtonMailFilter(name="Cached")
+
+    def test_fingerprint_ignores_status_only(self):
+        """Test that fingerprint covers everything except status."""
+        base = ProtonMailFilter(name="F", priority=1)
+        assert base.fingerprint == ProtonMailFilter(name="F", priority=1).fingerprint
+        assert base.fingerprint != ProtonMailFilter(name="F", priority=2).fingerprint
+        assert base.fingerprint != ProtonMailFilter(name="F", priority=1, enabled=False).fingerprint
+
+    def test_fingerprint_ignoring_enabled(self):
+        """Test that fingerprint_ignoring_enabled skips enabled and status."""
+        enabled = ProtonMailFilter(name="F", enabled=True)
+        disabled = ProtonMailFilter(name="F", enabled=False)
+        archived = ProtonMailFilter(name="F", status=FilterStatus.ARCHIVED)
+        assert enabled.fingerprint_ignoring_enabled == disabled.fingerprint_ignoring_enabled
+        assert enabled.fingerprint_ignoring_enabled == archived.fingerprint_ignoring_enabled
+
+    def test_fingerprint_ignores_parameter_order(self):
+        """Test that action parameter insertion order doesn't change the fingerprint."""
+        f1 = ProtonMailFilter(name="F", actions=[
+            FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work", "label": "x"}),
+        ])
+        f2 = ProtonMailFilter(name="F", actions=[
+            FilterAction(type=ActionType.MOVE_TO, parameters={"label": "x", "folder": "Work"}),
+        ])
+        assert f1.fingerprint == f2.fingerprint
+
+    def test_fingerprint_invalidated_on_assignment(self):
+        """Test that assigning a field refreshes the cached fingerprints."""
+        f = ProtonMailFilter(name="F")
+        before = f.fingerprint
+
+        f.priority = 5
+
+        assert f.fingerprint != before
+        assert f.fingerprint == ProtonMailFilter(name="F", priority=5).fingerprint
+
+    def test_actions_key_ignores_order(self):
+        """Test that actions_key ignores action and parameter order."""
+        f1 = ProtonMailFilter(name="A", actions=[
+            FilterAction(type=ActionType.STAR),
+            FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work", "label": "x"}),
+        ])
+        f2 = ProtonMailFilter(name="B", actions=[
+            FilterAction(type=ActionType.MOVE_TO, parameters={"label": "x", "folder": "Work"}),
+            FilterAction(type=ActionType.STAR),
+        ])
+        assert f1.actions_key == f2.actions_key
+        assert hash(f1.actions_key) == hash(f2.actions_key)
+
+    def test_actions_key_invalidated_on_assignment(self):
+        """Test that reassigning actions refreshes the cached key."""
+        f = ProtonMailFilter(name="F", actions=[FilterAction(type=ActionType.STAR)])
+        before = f.actions_key
+
+        f.actions = [FilterAction(type=ActionType.DELETE)]
+
+        assert f.actions_key != before
+        assert f.actions_key == frozenset({("delete", ())})
+
 
 class TestConsolidatedFilter:
     """Test ConsolidatedFilter model."""
@@ -259,6 +384,20 @@ class TestConsolidatedFilter:
         assert group.logic == LogicType.AND
         assert group.conditions == []
 
+    def test_min_priority(self):
+        """Test that min_priority picks the most important action and tracks assignment."""
+        cf = ConsolidatedFilter(name="CF", actions=[
+            FilterAction(type=ActionType.STAR),
+            FilterAction(type=ActionType.MOVE_TO, parameters={"folder": "Work"}),
+        ])
+        assert cf.min_priority == 2
+        assert ConsolidatedFilter(name="Empty").min_priority == 99
+
+        cf.actions = [FilterAction(type=ActionType.DELETE)]
+
+        assert cf.min_priority == 0
+        assert "min_priority" not in cf.model_dump()
+
 
 class TestBackupMetadata:
     """Test BackupMetadata model."""
@@ -468,6 +607,32 @@ class TestFilterStatus:
         )
         assert f_enabled.content_hash == f_archived.content_hash
 
+    def test_content_hash_cached_and_invalidated(self):
+        """Test that content_hash is cached, stable, and refreshed on assignment."""
+        f = ProtonMailFilter(name="Test", actions=[FilterAction(type=ActionType.DELETE)])
+        before = f.content_hash
+        assert f.content_hash is before
+        assert before == ProtonMailFilter(name="Test", actions=[FilterAction(type=ActionType.DELETE)]).content_hash
+
+        f.name = "Renamed"
+
+        assert f.content_hash != before
+        assert "content_hash" not in f.model_dump()
+
+    def test_model_copy_update_refreshes_cached_properties(self):
+        """Test that a shallow copy with status/enabled overrides drops stale caches."""
+        f = ProtonMailFilter(name="Test", enabled=True, actions=[FilterAction(type=ActionType.DELETE)])
+        fingerprint = f.fingerprint
+        content_hash = f.content_hash
+
+        archived = f.model_copy(update={"status": FilterStatus.ARCHIVED, "enabled": False})
+
+        assert archived.status == FilterStatus.ARCHIVED
+        assert archived.enabled is False
+        assert f.status == FilterStatus.ENABLED and f.enabled is True
+        assert archived.content_hash == content_hash
+        assert archived.fingerprint != fingerprint
+
     def test_status_from_string(self):
         """Test creating filter with status as string."""
         data = {"name": "Test", "status": "archived"}
@@ -100,6 +100,21 @@ async def test_parallel_scraping_5_workers(mock_scraper):
         await scraper.close()
 
 
+@pytest.mark.asyncio
+async def test_parallel_scraping_across_browsers(mock_scraper):
+    """Test 4 workers spread over 2 browser instances."""
+    scraper = mock_scraper
+    try:
+        await _setup_scraper_on_mock(scraper)
+        filters = await scraper.scrape_all_filters(workers=4, browsers=2)
+
+        assert [f["name"] for f in filters] == EXPECTED_NAMES
+        # Extra browsers are released as soon as scraping finishes
+        assert scraper._extra_browsers == []
+    finally:
+        await scraper.close()
+
+
 @pytest.mark.asyncio
 async def test_conditions_parsed(mock_scraper):
     """Verify conditions are correctly scraped from mock page."""
@@ -287,6 +287,28 @@ class TestParseScrapedFilters:
         result = parse_scraped_filters([])
         assert result == []
 
+    def test_parse_only_disabled(self):
+        """Test that enabled=False keeps only disabled filters."""
+        raw = [
+            {"name": "On", "enabled": True, "actions": [{"type": "delete"}]},
+            {"name": "Off", "enabled": False, "actions": [{"type": "delete"}]},
+            {"name": "Default", "actions": [{"type": "delete"}]},
+        ]
+        result = parse_scraped_filters(raw, enabled=False)
+        assert [f.name for f in result] == ["Off"]
+        assert [f.name for f in parse_scraped_filters(raw, enabled=True)] == ["On", "Default"]
+
+    def test_parse_only_disabled_skips_malformed(self, caplog):
+        """Test that a malformed item is logged and skipped when filtering by enabled."""
+        raw = [
+            {"name": "Off", "enabled": False, "actions": [{"type": "delete"}]},
+            None,
+        ]
+        with caplog.at_level(logging.WARNING):
+            result = parse_scraped_filters(raw, enabled=False)
+        assert [f.name for f in result] == ["Off"]
+        assert "Failed to parse filter" in caplog.text
+
     def test_parse_single_filter(self):
         """Test parsing single filter."""
         raw = [{
@@ -0,0 +1,108 @@
+"""Tests for RestoreEngine (using a fake sync client, no browser)."""
+
+import asyncio
+
+import pytest
+
+from src.backup.restore_engine import RestoreEngine
+from src.models.backup_models import Backup
+from src.models.filter_models import ProtonMailFilter, FilterStatus
+
+
+class FakeSync:
+    """Records toggle calls and tracks how many run at once."""
+
+    def __init__(self, fail=(), raise_on=()):
+        self.calls = []
+        self.fail = set(fail)
+        self.raise_on = set(raise_on)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _toggle(self, name, enabled):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self.calls.append((name, enabled))
+            if name in self.raise_on:
+                raise RuntimeError("toggle broke")
+            return name not in self.fail
+        finally:
+            self.in_flight -= 1
+
+    async def enable_filter(self, name):
+        return await self._toggle(name, True)
+
+    async def disable_filter(self, name):
+        return await self._toggle(name, False)
+
+
+def _backup_and_current():
+    backup = Backup(filters=[
+        ProtonMailFilter(name="A", enabled=True),
+        ProtonMailFilter(name="B", enabled=False),
+        ProtonMailFilter(name="C", enabled=True),
+        ProtonMailFilter(name="D", enabled=True),
+        ProtonMailFilter(name="Old", status=FilterStatus.ARCHIVED),
+        ProtonMailFilter(name="Gone", enabled=True),
+    ])
+    current = [
+        ProtonMailFilter(name="A", enabled=False),
+        ProtonMailFilter(name="B", enabled=True),
+        ProtonMailFilter(name="C", enabled=True),
+        ProtonMailFilter(name="D", enabled=False),
+    ]
+    return backup, current
+
+
+class TestRestoreEngine:
+    """Test RestoreEngine.restore_from_backup."""
+
+    @pytest.mark.asyncio
+    async def test_restore_report(self):
+        """Test that each filter lands in the right report bucket."""
+        backup, current = _backup_and_current()
+        sync = FakeSync()
+
+        report = await RestoreEngine(sync).restore_from_backup(backup, current)
+
+        assert report["enabled"] == ["A", "D"]
+        assert report["disabled"] == ["B"]
+        assert report["already_correct"] == ["C"]
+        assert report["skipped"] == ["Old"]
+        assert report["not_found"] == ["Gone"]
+        assert report["errors"] == []
+
+    @pytest.mark.asyncio
+    async def test_restore_sequential_by_default(self):
+        """Test that toggles run one at a time unless concurrency is raised."""
+        backup, current = _backup_and_current()
+        sync = FakeSync()
+
+        await RestoreEngine(sync).restore_from_backup(backup, current)
+
+        assert sync.max_in_flight == 1
+        assert [name for name, _ in sync.calls] == ["A", "B", "D"]
+
+    @pytest.mark.asyncio
+    async def test_restore_bounded_concurrency(self):
+        """Test that concurrency > 1 overlaps toggles but keeps report order."""
+        backup, current = _backup_and_current()
+        sync = FakeSync()
+
+        report = await RestoreEngine(sync, concurrency=2).restore_from_backup(backup, current)
+
+        assert sync.max_in_flight == 2
+        assert report["enabled"] == ["A", "D"]
+
+    @pytest.mark.asyncio
+    async def test_restore_collects_errors(self):
+        """Test that failed and raising toggles are reported as errors."""
+        backup, current = _backup_and_current()
+        sync = FakeSync(fail={"A"}, raise_on={"B"})
+
+        report = await RestoreEngine(sync).restore_from_backup(backup, current)
+
+        assert report["enabled"] == ["D"]
+        assert report["errors"] == ["Failed to enable: A", "B: toggle broke"]
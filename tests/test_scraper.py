@@ -7,6 +7,7 @@ from src.scraper.protonmail_scraper import (
     ProtonMailScraper,
     BULLET_CHARS,
 )
+from src.scraper.protonmail_sync import ProtonMailSync
 
 
 class TestDistributeIndices:
@@ -97,3 +98,96 @@ class TestResolveFolderPath:
     def test_no_match_returns_clean(self):
         scraper = self._make_scraper({"Other": "Other"})
         assert scraper._resolve_folder_path("Unknown") == "Unknown"
+
+
+class _FakePage:
+    """Minimal page for worker tabs: navigation is a no-op."""
+
+    url = "https://mail.proton.me/filters"
+
+    def __init__(self):
+        self.closed = False
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class _RecordingSync(ProtonMailSync):
+    """ProtonMailSync whose deletes only record which page they ran on."""
+
+    def __init__(self, missing=()):
+        super().__init__()
+        self.page = _FakePage()
+        self.worker_pages = []
+        self.calls = []
+        self.missing = set(missing)
+
+    async def create_worker_page(self):
+        page = _FakePage()
+        self.worker_pages.append(page)
+        return page
+
+    async def delete_filter(self, name, page=None):
+        self.calls.append((name, page or self.page))
+        if name == "boom":
+            raise RuntimeError("dropdown vanished")
+        return name not in self.missing
+
+
+class TestDeleteFilters:
+    """Test ProtonMailSync.delete_filters worker distribution (no browser)."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_uses_main_page(self):
+        sync = _RecordingSync(missing={"b"})
+        assert await sync.delete_filters(["a", "b", "c"]) == ["a", "c"]
+        assert all(page is sync.page for _, page in sync.calls)
+        assert sync.worker_pages == []
+
+    @pytest.mark.asyncio
+    async def test_parallel_spreads_names_over_worker_tabs(self):
+        sync = _RecordingSync()
+        names = [f"f{i}" for i in range(5)]
+        assert await sync.delete_filters(names, workers=2) == names
+        assert len(sync.worker_pages) == 2
+        assert all(page.closed for page in sync.worker_pages)
+        assert {page for _, page in sync.calls} == set(sync.worker_pages)
+
+    @pytest.mark.asyncio
+    async def test_parallel_skips_failures(self):
+        sync = _RecordingSync(missing={"gone"})
+        result = await sync.delete_filters(["a", "gone", "boom", "d"], workers=2)
+        assert result == ["a", "d"]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_names_stay_sequential(self):
+        sync = _RecordingSync()
+        assert await sync.delete_filters(["dup", "x", "dup"], workers=3) == ["dup", "x", "dup"]
+        assert sync.worker_pages == []
+
+
+class TestFromSession:
+    """Test handing a logged-in browser from the scraper to the sync client."""
+
+    @pytest.mark.asyncio
+    async def test_sync_takes_over_scraper_browser(self):
+        """Test that the sync client gets the session and the scraper no longer owns it."""
+        scraper = ProtonMailScraper(headless=True)
+        scraper.browser, scraper.context, scraper.page = object(), object(), _FakePage()
+        scraper.account_email = "user@proton.me"
+        page = scraper.page
+
+        sync = ProtonMailSync.from_session(scraper)
+
+        assert isinstance(sync, ProtonMailSync)
+        assert sync.page is page
+        assert sync.headless is True
+        assert sync.account_email == "user@proton.me"
+        assert scraper.browser is scraper.context is scraper.page is None
+        await scraper.close()  # nothing left to close
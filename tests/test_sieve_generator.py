@@ -297,6 +297,24 @@ class TestSieveGenerator:
         assert "spam2@test.com" in script
         assert "spam3@test.com" in script
 
+    def test_generate_merged_values_list_keeps_pipes(self):
+        """Test that a merged values list is used as-is, so a literal '|' is not split."""
+        gen = SieveGenerator()
+        cf = ConsolidatedFilter(
+            name="Test",
+            condition_groups=[ConditionGroup(conditions=[
+                FilterCondition(
+                    type=ConditionType.SUBJECT, operator=Operator.CONTAINS,
+                    value="a|b|c", values=["a|b", "c"],
+                )
+            ])],
+            actions=[FilterAction(type=ActionType.DELETE)]
+        )
+
+        script = gen.generate([cf])
+
+        assert 'header :contains "Subject" ["a|b", "c"]' in script
+
     def test_generate_multiple_actions(self):
         """Test generating multiple actions."""
         gen = SieveGenerator()
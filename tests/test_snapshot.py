@@ -1,4 +1,4 @@
-"""Tests for snapshot CLI commands (view, set-status, remove)."""
+"""Tests for snapshot CLI commands (view, set-status, set-status-batch, remove)."""
 
 import json
 import os
@@ -7,7 +7,6 @@ from pathlib import Path
 
 from typer.testing import CliRunner
 
-import src.utils.config
 from src.main import app, console
 from src.backup.backup_manager import BackupManager
 from src.models.filter_models import (
@@ -19,25 +18,7 @@ from src.models.backup_models import ArchiveEntry
 
 runner = CliRunner()
 
-
-@pytest.fixture(autouse=True)
-def _wide_console(monkeypatch):
-    """Ensure Rich console is wide enough for full table output in CliRunner."""
-    import src.main
-    from rich.console import Console
-    wide_console = Console(width=200)
-    monkeypatch.setattr(src.main, "console", wide_console)
-
-
-@pytest.fixture
-def cli_snapshots_dir(tmp_path, monkeypatch):
-    """Set up a temp snapshots dir that the CLI will use via BackupManager()."""
-    import src.backup.backup_manager
-    snapshots_dir = tmp_path / "snapshots"
-    snapshots_dir.mkdir()
-    monkeypatch.setattr(src.utils.config, "SNAPSHOTS_DIR", snapshots_dir)
-    monkeypatch.setattr(src.backup.backup_manager, "SNAPSHOTS_DIR", snapshots_dir)
-    return snapshots_dir
+pytestmark = pytest.mark.usefixtures("wide_console")
 
 
 class TestSnapshotView:
@@ -81,6 +62,20 @@ class TestSnapshotView:
         assert result.exit_code == 0
         assert "Snapshot View" in result.output
 
+    def test_view_prints_brackets_literally(self, cli_snapshots_dir):
+        """Test that markup-like text in filter names and values is shown, not parsed."""
+        f = ProtonMailFilter(
+            name="Tagged [/x]",
+            conditions=[FilterCondition(type=ConditionType.SUBJECT, operator=Operator.CONTAINS, value="[SPAM]")],
+            actions=[FilterAction(type=ActionType.DELETE)],
+        )
+        BackupManager(cli_snapshots_dir).create_backup([f])
+
+        result = runner.invoke(app, ["snapshot", "view"])
+        assert result.exit_code == 0, result.output
+        assert "Tagged [/x]" in result.output
+        assert '"[SPAM]"' in result.output
+
     def test_view_empty_snapshot(self, cli_snapshots_dir):
         """Test viewing snapshot with no filters."""
         manager = BackupManager(cli_snapshots_dir)
@@ -147,6 +142,30 @@ class TestSnapshotSetStatus:
         assert len(entries) == 1
         assert entries[0].filter.status == FilterStatus.DEPRECATED
 
+    def test_set_status_archive_hit_skips_backup(self, cli_snapshots_dir, sample_filters_list):
+        """Test that updating an archive entry does not read backup.json."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        snapshot_dir = manager.snapshot_dir_for("latest")
+        f = sample_filters_list[0].model_copy(deep=True)
+        f.status = FilterStatus.ARCHIVED
+        manager.write_archive(snapshot_dir, [ArchiveEntry(filter=f)])
+        (snapshot_dir / "backup.json").write_text("not json")
+
+        result = runner.invoke(app, ["snapshot", "set-status", "Spam Filter 1", "enabled"])
+        assert result.exit_code == 0
+        assert manager.load_archive(snapshot_dir)[0].filter.status == FilterStatus.ENABLED
+
+    def test_set_status_unchanged(self, cli_snapshots_dir, sample_filters_list):
+        """Test that re-applying an archive entry's status reports no change."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        runner.invoke(app, ["snapshot", "set-status", "Spam Filter 1", "deprecated"])
+
+        result = runner.invoke(app, ["snapshot", "set-status", "Spam Filter 1", "deprecated"])
+        assert result.exit_code == 0
+        assert "no change" in result.output
+
     def test_set_status_filter_not_found(self, cli_snapshots_dir, sample_filters_list):
         """Test setting status of non-existent filter."""
         manager = BackupManager(cli_snapshots_dir)
@@ -166,6 +185,73 @@ class TestSnapshotSetStatus:
             assert result.exit_code == 0, f"Failed for status={status}: {result.output}"
 
 
+class TestSnapshotSetStatusBatch:
+    """Test 'snapshot set-status-batch' command."""
+
+    def test_batch_from_set_and_file(self, cli_snapshots_dir, sample_filters_list, tmp_path):
+        """Test that --set overrides --file and all updates land in one archive."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        updates_file = tmp_path / "updates.json"
+        updates_file.write_text(json.dumps({"Spam Filter 1": "archived", "Move to Spam": "disabled"}))
+
+        result = runner.invoke(app, [
+            "snapshot", "set-status-batch",
+            "--file", str(updates_file),
+            "--set", "Spam Filter 1=deprecated",
+        ])
+        assert result.exit_code == 0, result.output
+        assert "created 2" in result.output
+
+        by_name = {e.filter.name: e.filter.status for e in manager.load_archive(manager.snapshot_dir_for("latest"))}
+        assert by_name == {"Spam Filter 1": FilterStatus.DEPRECATED, "Move to Spam": FilterStatus.DISABLED}
+
+    def test_batch_invalid_status(self, cli_snapshots_dir, sample_filters_list):
+        """Test that an invalid status fails before anything is written."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+
+        result = runner.invoke(app, ["snapshot", "set-status-batch", "--set", "Spam Filter 1=bogus"])
+        assert result.exit_code == 1
+        assert "Invalid status" in result.output
+        assert manager.load_archive(manager.snapshot_dir_for("latest")) == []
+
+    def test_batch_reports_missing(self, cli_snapshots_dir, sample_filters_list):
+        """Test that missing names exit 1 while found names are still written."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+
+        result = runner.invoke(app, [
+            "snapshot", "set-status-batch",
+            "--set", "Spam Filter 1=deprecated",
+            "--set", "NonExistent=archived",
+        ])
+        assert result.exit_code == 1
+        assert "Filter not found: 'NonExistent'" in result.output
+        assert len(manager.load_archive(manager.snapshot_dir_for("latest"))) == 1
+
+    def test_batch_requires_updates(self, cli_snapshots_dir):
+        """Test that calling without updates fails."""
+        result = runner.invoke(app, ["snapshot", "set-status-batch"])
+        assert result.exit_code == 1
+        assert "No updates" in result.output
+
+    @pytest.mark.parametrize("content", [None, "{not json", '["Spam Filter 1", "archived"]'])
+    def test_batch_bad_file(self, cli_snapshots_dir, sample_filters_list, tmp_path, content):
+        """Test that a missing, invalid or non-object --file exits 1 without a traceback."""
+        manager = BackupManager(cli_snapshots_dir)
+        manager.create_backup(sample_filters_list)
+        updates_file = tmp_path / "updates.json"
+        if content is not None:
+            updates_file.write_text(content)
+
+        result = runner.invoke(app, ["snapshot", "set-status-batch", "--file", str(updates_file)])
+        assert result.exit_code == 1
+        assert "Could not read --file" in result.output
+        assert not isinstance(result.exception, (OSError, ValueError, TypeError))
+        assert manager.load_archive(manager.snapshot_dir_for("latest")) == []
+
+
 class TestSnapshotRemove:
     """Test 'snapshot remove' command."""
 
@@ -195,6 +281,7 @@ class TestSnapshotRemove:
         result = runner.invoke(app, ["snapshot", "remove", "Spam Filter 1"])
         assert result.exit_code == 1
         assert "immutable" in result.output.lower() or "backup" in result.output.lower()
+        assert 'set-status "Spam Filter 1" deprecated' in result.output
 
     def test_remove_nonexistent_filter(self, cli_snapshots_dir, sample_filters_list):
         """Test removing a filter that doesn't exist anywhere."""